@@ -0,0 +1,81 @@
+"""Show that concurrent Gemini streams on one worker overlap instead of serializing.
+
+Runs N concurrent ``stream_chat_response`` calls against a fake Gemini client
+whose chunks arrive after a fixed delay. With a non-blocking stream the wall
+time stays close to one generation regardless of N; the ``--blocking`` mode
+mimics the old synchronous iterator for comparison.
+
+    python -m benchmarks.bench_concurrent_chat --clients 1 10 50
+"""
+import argparse
+import asyncio
+import time
+
+from services import claude_service, resources
+
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeAsyncModels:
+    def __init__(self, chunks: int, delay: float):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def generate_content_stream(self, **kwargs):
+        async def stream():
+            for i in range(self.chunks):
+                await asyncio.sleep(self.delay)
+                yield _Chunk(f"token{i} ")
+        return stream()
+
+
+class _FakeSyncModels(_FakeAsyncModels):
+    async def generate_content_stream(self, **kwargs):
+        # Same timing, but each chunk blocks the event loop like the sync SDK iterator
+        async def stream():
+            for i in range(self.chunks):
+                time.sleep(self.delay)
+                yield _Chunk(f"token{i} ")
+        return stream()
+
+
+class _FakeClient:
+    def __init__(self, models):
+        self.aio = type("aio", (), {"models": models})()
+
+
+async def _run(clients: int) -> float:
+    messages = [{"role": "user", "content": "nba scores tonight"}]
+
+    async def one():
+        async for _ in claude_service.stream_chat_response(messages):
+            pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+
+    models_cls = _FakeSyncModels if args.blocking else _FakeAsyncModels
+    resources._gemini = _FakeClient(models_cls(args.chunks, args.delay))
+
+    single = args.chunks * args.delay
+    print(f"{'clients':>8} {'wall_s':>8} {'x_single':>9}")
+    for n in args.clients:
+        wall = asyncio.run(_run(n))
+        print(f"{n:>8} {wall:>8.3f} {wall / single:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare the compiled intent matcher with the old per-sport substring scans.
+
+Reports per-query latency, exact-match accuracy on the labelled corpus, and
+"wasted fetches": scoreboards the detector would fetch that the query did not
+need.
+
+    python -m benchmarks.bench_intent
+"""
+import json
+import time
+from pathlib import Path
+
+from services.intent_service import SCORE_KEYWORDS, SEARCH_KEYWORDS, SPORT_KEYWORDS, match_intent
+
+CORPUS = Path(__file__).with_name("intent_corpus.json")
+ROUNDS = 2000
+
+
+def legacy_detect(text: str) -> tuple[list[str], bool]:
+    """The substring-scan detector this matcher replaced."""
+    text_lower = text.lower()
+    search = any(kw in text_lower for kw in SEARCH_KEYWORDS)
+    if not any(kw in text_lower for kw in SCORE_KEYWORDS):
+        return [], search
+    sports = [s for s, kws in SPORT_KEYWORDS.items() if any(kw in text_lower for kw in kws)]
+    return sports, search
+
+
+def compiled_detect(text: str) -> tuple[list[str], bool]:
+    intent = match_intent(text)
+    return (intent.sports if intent.is_score_query else []), intent.is_search_query
+
+
+def evaluate(name, detect, corpus) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for case in corpus:
+            detect(case["text"])
+    per_query_us = (time.perf_counter() - start) / (ROUNDS * len(corpus)) * 1e6
+
+    correct = wasted = missed = search_wrong = 0
+    for case in corpus:
+        sports, search = detect(case["text"])
+        expected = set(case["sports"])
+        correct += set(sports) == expected
+        wasted += len(set(sports) - expected)
+        missed += len(expected - set(sports))
+        search_wrong += search != case["search"]
+
+    print(f"{name:>10} {per_query_us:>8.2f} {correct:>4}/{len(corpus)} {wasted:>7} {missed:>7} {search_wrong:>8}")
+
+
+def main() -> None:
+    corpus = json.loads(CORPUS.read_text())
+    print(f"{'detector':>10} {'us/query':>8} {'exact':>7} {'wasted':>7} {'missed':>7} {'search_x':>8}")
+    evaluate("legacy", legacy_detect, corpus)
+    evaluate("compiled", compiled_detect, corpus)
+
+
+if __name__ == "__main__":
+    main()
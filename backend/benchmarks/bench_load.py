@@ -0,0 +1,303 @@
+"""Offline load test of /api/chat, /api/scores and /api/news against local stand-ins.
+
+Runs the real app under uvicorn on a local port with ESPN, Tavily, Gemini and
+Supabase replaced by the stand-ins in ``benchmarks.standins``, then drives it
+from a separate thread at each concurrency level for a fixed duration.
+
+Reports per endpoint p50/p99 time to first byte (TTFT for /api/chat), total
+latency, RPS and errors, plus the server event loop's scheduling lag. Each
+run is appended to a JSONL results file and compared with the previous run
+that used the same settings, so regressions show up between runs.
+
+    python -m benchmarks.bench_load --concurrency 1 10 50 --duration 10
+    python -m benchmarks.bench_load --gemini-ttft 0.8 --fail-on-regression
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import subprocess
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import uvicorn
+
+from benchmarks.standins import FakeESPN, FakeGemini, FakeSupabase, FakeTavily, install
+
+HERE = Path(__file__).parent
+DEFAULT_RESULTS = HERE / "results" / "load.jsonl"
+LAG_INTERVAL = 0.01
+# Latency changes smaller than this are noise, whatever the percentage
+MIN_DELTA_MS = 5.0
+
+# Metrics compared against the previous run: (endpoint, field, higher_is_worse)
+TRACKED = [
+    ("chat", "ttfb_p50", True),
+    ("chat", "ttfb_p99", True),
+    ("chat", "rps", False),
+    ("scores", "total_p99", True),
+    ("news", "total_p99", True),
+    ("loop", "lag_p99", True),
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _LoopLag:
+    """Measures how late the event loop wakes a task that sleeps LAG_INTERVAL."""
+
+    def __init__(self):
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(max(0.0, time.perf_counter() - start - LAG_INTERVAL))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def take(self) -> list[float]:
+        samples, self.samples = self.samples, []
+        return samples
+
+
+# --- Load generator (runs in its own thread and event loop) ---
+
+def _requests(corpus: list[str]) -> dict[str, Any]:
+    return {
+        "chat": lambda: {
+            "method": "POST", "url": "/api/chat",
+            "json": {"messages": [{"role": "user", "content": random.choice(corpus)}],
+                     "conversation_id": str(uuid.uuid4())},
+        },
+        "scores": lambda: {"method": "GET", "url": "/api/scores",
+                           "params": {"sport": random.choice(["nba", "nfl", "soccer", "ipl"])}},
+        "news": lambda: {"method": "GET", "url": "/api/news",
+                         "params": {"count": random.choice([4, 8])}},
+    }
+
+
+async def _drive(base_url: str, concurrency: int, duration: float, mix: dict[str, float],
+                 corpus: list[str]) -> dict[str, dict[str, list]]:
+    builders = _requests(corpus)
+    endpoints, weights = list(mix), list(mix.values())
+    samples = {name: {"ttfb": [], "total": [], "errors": []} for name in endpoints}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = random.choices(endpoints, weights)[0]
+                stats = samples[name]
+                start = time.perf_counter()
+                first = None
+                try:
+                    async with client.stream(**builders[name]()) as response:
+                        async for chunk in response.aiter_raw():
+                            # Chat opens with a stream-id event; TTFT is the first text event
+                            if first is None and chunk and (name != "chat" or b'"text"' in chunk):
+                                first = time.perf_counter()
+                    if response.status_code >= 400:
+                        stats["errors"].append(response.status_code)
+                        continue
+                except httpx.HTTPError as e:
+                    stats["errors"].append(type(e).__name__)
+                    continue
+                end = time.perf_counter()
+                stats["ttfb"].append((first or end) - start)
+                stats["total"].append(end - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def _summarize(samples: dict[str, dict[str, list]], lag: list[float], duration: float) -> dict[str, Any]:
+    level: dict[str, Any] = {}
+    for name, stats in samples.items():
+        level[name] = {
+            "requests": len(stats["total"]),
+            "errors": len(stats["errors"]),
+            "rps": round(len(stats["total"]) / duration, 2),
+            "ttfb_p50": _ms(_percentile(stats["ttfb"], 50)),
+            "ttfb_p99": _ms(_percentile(stats["ttfb"], 99)),
+            "total_p50": _ms(_percentile(stats["total"], 50)),
+            "total_p99": _ms(_percentile(stats["total"], 99)),
+        }
+    level["loop"] = {
+        "lag_p50": _ms(_percentile(lag, 50)),
+        "lag_p99": _ms(_percentile(lag, 99)),
+        "lag_max": _ms(max(lag, default=0.0)),
+    }
+    return level
+
+
+# --- Results history ---
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=HERE, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _previous_run(path: Path, config: dict[str, Any]) -> Optional[dict[str, Any]]:
+    if not path.exists():
+        return None
+    previous = None
+    for line in path.read_text().splitlines():
+        if line.strip():
+            run = json.loads(line)
+            if run.get("config") == config:
+                previous = run
+    return previous
+
+
+def _compare(run: dict[str, Any], previous: dict[str, Any], threshold: float) -> list[str]:
+    """Tracked metrics that got worse by more than ``threshold`` (a fraction)."""
+    regressions = []
+    print(f"\nCompared with {previous['revision'] or 'previous run'} ({previous['timestamp']}):")
+    for concurrency, level in run["levels"].items():
+        before = previous["levels"].get(concurrency)
+        if before is None:
+            continue
+        for endpoint, field, higher_is_worse in TRACKED:
+            new = level.get(endpoint, {}).get(field)
+            old = before.get(endpoint, {}).get(field)
+            if not new or not old:
+                continue
+            change = (new - old) / old
+            if higher_is_worse:
+                worse = change > threshold and new - old > MIN_DELTA_MS
+            else:
+                worse = change < -threshold
+            flag = "  REGRESSION" if worse else ""
+            print(f"  c={concurrency:>4} {endpoint:>6}.{field:<10} {old:>9} -> {new:>9} ({change:+.1%}){flag}")
+            if worse:
+                regressions.append(f"c={concurrency} {endpoint}.{field}")
+    return regressions
+
+
+# --- Server ---
+
+async def _serve_and_drive(args: argparse.Namespace, config: dict[str, Any]) -> dict[str, Any]:
+    # Imported here so the app's logging setup can be quieted before the run
+    import main
+
+    logging.getLogger("sportsgpt").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    stand_ins = install(
+        espn=FakeESPN(args.espn_latency, Path(args.fixtures) if args.fixtures else None),
+        tavily=FakeTavily(args.search_latency),
+        gemini=FakeGemini(args.gemini_ttft, args.gemini_tps, args.gemini_tokens),
+        supabase=FakeSupabase(args.db_latency),
+    )
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port,
+                                           log_level="warning", lifespan="on"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    corpus = [item["text"] for item in json.loads((HERE / "intent_corpus.json").read_text())]
+    mix = dict(zip(("chat", "scores", "news"), args.mix))
+    lag = _LoopLag()
+    lag.start()
+    levels = {}
+    try:
+        for concurrency in args.concurrency:
+            lag.take()
+            samples = await asyncio.to_thread(
+                lambda: asyncio.run(_drive(f"http://127.0.0.1:{port}", concurrency, args.duration, mix, corpus)))
+            levels[str(concurrency)] = _summarize(samples, lag.take(), args.duration)
+    finally:
+        server.should_exit = True
+        await serve_task
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "label": args.label,
+        "config": config,
+        "levels": levels,
+        "upstream_requests": stand_ins.request_counts(),
+    }
+
+
+def _print_run(run: dict[str, Any]) -> None:
+    print(f"{'conc':>5} {'endpoint':>8} {'reqs':>6} {'err':>4} {'rps':>8} "
+          f"{'ttfb_p50':>9} {'ttfb_p99':>9} {'total_p50':>10} {'total_p99':>10}")
+    for concurrency, level in run["levels"].items():
+        for name, s in level.items():
+            if name == "loop":
+                continue
+            print(f"{concurrency:>5} {name:>8} {s['requests']:>6} {s['errors']:>4} {s['rps']:>8} "
+                  f"{s['ttfb_p50']:>9} {s['ttfb_p99']:>9} {s['total_p50']:>10} {s['total_p99']:>10}")
+        loop = level["loop"]
+        print(f"{concurrency:>5} {'loop lag':>8}  p50={loop['lag_p50']}ms p99={loop['lag_p99']}ms "
+              f"max={loop['lag_max']}ms")
+    print(f"upstream requests: {run['upstream_requests']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", type=float, nargs=3, default=[0.6, 0.3, 0.1],
+                        metavar=("CHAT", "SCORES", "NEWS"), help="request mix weights")
+    parser.add_argument("--espn-latency", type=float, default=0.08)
+    parser.add_argument("--search-latency", type=float, default=0.6)
+    parser.add_argument("--gemini-ttft", type=float, default=0.5)
+    parser.add_argument("--gemini-tps", type=float, default=80.0, help="streamed chunks per second")
+    parser.add_argument("--gemini-tokens", type=int, default=60, help="chunks per response")
+    parser.add_argument("--db-latency", type=float, default=0.03)
+    parser.add_argument("--fixtures", help="directory of recorded <sport>.json ESPN scoreboards")
+    parser.add_argument("--results", default=str(DEFAULT_RESULTS), help="JSONL file runs are appended to")
+    parser.add_argument("--label", default="", help="free-form note stored with the run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="regression threshold (fraction)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    config = {key: value for key, value in vars(args).items()
+              if key not in ("results", "label", "threshold", "fail_on_regression")}
+    run = asyncio.run(_serve_and_drive(args, config))
+    _print_run(run)
+
+    results = Path(args.results)
+    previous = _previous_run(results, config)
+    results.parent.mkdir(parents=True, exist_ok=True)
+    with results.open("a") as f:
+        f.write(json.dumps(run) + "\n")
+
+    regressions = _compare(run, previous, args.threshold) if previous else []
+    if regressions and args.fail_on_regression:
+        raise SystemExit(f"Regressions: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
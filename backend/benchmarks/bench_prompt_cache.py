@@ -0,0 +1,178 @@
+"""Billed input tokens and TTFT under provider prefix caching.
+
+Drives ``claude_service.stream_chat_response`` through multi-turn
+conversations whose live scores change every turn, against a fake Gemini
+that bills input tokens the way prefix caching does: the longest prefix
+shared with an earlier request (at least ``--min-prefix`` tokens, the
+model's minimum cacheable size) is charged at the cached rate, and only
+uncached tokens add prefill time to the time to first token. Explicit cached
+content (``caches.create``) is honoured the same way.
+
+    python -m benchmarks.bench_prompt_cache
+    python -m benchmarks.bench_prompt_cache --explicit
+    python benchmarks/bench_prompt_cache.py --app-dir /path/to/other/checkout/backend
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+HERE = Path(__file__).resolve().parent
+
+# Gemini 2.5 bills cached input tokens at a quarter of the normal rate
+CACHED_TOKEN_RATE = 0.25
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4
+
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Cache:
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+
+
+class PrefixCachingGemini:
+    """Fake Gemini that accounts for cached prefixes and models prefill time."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.history: list[str] = []
+        self.caches: dict[str, _Cache] = {}
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.requests = 0
+        models = type("models", (), {"generate_content_stream": self._stream, "generate_content": self._generate})
+        caches = type("caches", (), {"create": self._create_cache})
+        self.aio = type("aio", (), {"models": models(), "caches": caches()})()
+
+    async def _create_cache(self, model: str, config: dict[str, Any]) -> _Cache:
+        text = config["system_instruction"]
+        if _tokens(text) < self.args.min_prefix:
+            raise ValueError(f"400 INVALID_ARGUMENT: cached content is {_tokens(text)} tokens, "
+                             f"minimum is {self.args.min_prefix}")
+        cache = _Cache(f"cachedContents/{len(self.caches)}", text)
+        self.caches[cache.name] = cache
+        return cache
+
+    def _account(self, contents: Any, config: dict[str, Any]) -> float:
+        """Record token usage for one request and return its prefill time."""
+        explicit = ""
+        if config.get("cached_content"):
+            explicit = self.caches[config["cached_content"]].text
+        parts = [config.get("system_instruction", "")]
+        for turn in contents if isinstance(contents, list) else [{"role": "user", "parts": [{"text": contents}]}]:
+            parts.extend(f"{turn['role']}:{part['text']}" for part in turn["parts"])
+        text = "\x00".join(parts)
+
+        prefix = max((len(os.path.commonprefix([text, seen])) for seen in self.history), default=0)
+        implicit = _tokens(text[:prefix])
+        if implicit < self.args.min_prefix:
+            implicit = 0
+        self.history.append(text)
+
+        total = _tokens(explicit) + _tokens(text)
+        cached = _tokens(explicit) + implicit
+        self.requests += 1
+        self.input_tokens += total
+        self.cached_tokens += cached
+        return (total - cached) / self.args.prefill_tps
+
+    async def _stream(self, model: str, contents: Any, config: dict[str, Any]):
+        prefill = self._account(contents, config)
+
+        async def stream():
+            await asyncio.sleep(self.args.ttft + prefill)
+            for i in range(self.args.output_tokens):
+                yield _Chunk(f"token{i} ")
+        return stream()
+
+    async def _generate(self, model: str, contents: Any, config: Optional[dict[str, Any]] = None):
+        await asyncio.sleep(self.args.ttft + self._account(contents, config or {}))
+        return _Chunk("Summary of the earlier conversation.")
+
+
+def _scores(turn: int, games: int) -> str:
+    # Live games move every turn, so the scores block never repeats
+    return "\n".join(
+        f"- Team {g}A {90 + (g * 7 + turn * 3) % 30} @ Team {g}B {88 + (g * 5 + turn * 2) % 30} "
+        f"(In Progress, Q{1 + turn % 4} {12 - turn % 12}:{(g * 13) % 60:02d})"
+        for g in range(games)
+    )
+
+
+async def _conversation(claude_service, n: int, args: argparse.Namespace) -> list[float]:
+    messages: list[dict[str, str]] = []
+    ttfts = []
+    for turn in range(args.turns):
+        messages.append({"role": "user", "content": f"Conversation {n}, turn {turn}: how are the nba games going?"})
+        start = time.perf_counter()
+        first = None
+        reply = []
+        async for chunk in claude_service.stream_chat_response(
+            messages, _scores(turn, args.games), f"Summary: story {turn}. " * args.search_sentences,
+            conversation_id=f"bench-{n}", sport="nba", user_id="bench",
+        ):
+            if first is None:
+                first = time.perf_counter() - start
+            reply.append(chunk)
+        ttfts.append(first)
+        messages.append({"role": "assistant", "content": "".join(reply)})
+    return ttfts
+
+
+async def _run(args: argparse.Namespace) -> None:
+    import logging
+
+    from config import settings
+    from services import claude_service, resources
+
+    logging.getLogger("sportsgpt").setLevel(logging.WARNING)
+    if args.explicit:
+        settings.gemini_prefix_cache = True
+    fake = PrefixCachingGemini(args)
+    resources._gemini = fake
+
+    results = await asyncio.gather(*(_conversation(claude_service, n, args) for n in range(args.conversations)))
+    ttfts = sorted(t * 1000 for r in results for t in r)
+    billed = fake.input_tokens - fake.cached_tokens * (1 - CACHED_TOKEN_RATE)
+    print(f"app: {args.app_dir}  ({args.conversations} conversations x {args.turns} turns, "
+          f"min prefix {args.min_prefix} tokens, explicit={args.explicit})")
+    print(f"  requests        {fake.requests:>10}")
+    print(f"  input tokens    {fake.input_tokens:>10}")
+    print(f"  cached tokens   {fake.cached_tokens:>10}  ({fake.cached_tokens / fake.input_tokens:.0%})")
+    print(f"  billed tokens   {billed:>10.0f}")
+    print(f"  ttft p50 / p99  {statistics.median(ttfts):>7.0f} / {ttfts[int(len(ttfts) * 0.99)]:.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app-dir", default=str(HERE.parent), help="backend directory to measure")
+    parser.add_argument("--conversations", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--games", type=int, default=12, help="live games in the scores block")
+    parser.add_argument("--search-sentences", type=int, default=40)
+    parser.add_argument("--min-prefix", type=int, default=1024, help="minimum cacheable prefix (tokens)")
+    parser.add_argument("--explicit", action="store_true", help="enable explicit prefix caching")
+    parser.add_argument("--ttft", type=float, default=0.15, help="fake time to first token excluding prefill")
+    parser.add_argument("--prefill-tps", type=float, default=10_000, help="uncached input tokens per second")
+    parser.add_argument("--output-tokens", type=int, default=120)
+    args = parser.parse_args()
+
+    os.chdir(args.app_dir)
+    sys.path.insert(0, args.app_dir)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Micro-benchmark the scoreboard parser against the dict-per-game parser it replaced.
+
+    python -m benchmarks.bench_scoreboard_parse
+"""
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any
+
+from benchmarks.fixtures import EVENT_COUNTS, scoreboard_bytes
+from services.sports_service import CRICKET_SPORTS, MAX_STALENESS, parse_scoreboard
+
+ROUNDS = 200
+
+
+def _legacy_is_recent(date_str: str) -> bool:
+    if not date_str:
+        return False
+    try:
+        game_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        now = datetime.now(timezone.utc)
+        return (now - game_date) < MAX_STALENESS
+    except (ValueError, TypeError):
+        return False
+
+
+def legacy_parse(content: bytes, sport: str) -> list[dict[str, Any]]:
+    """The previous get_live_scores body: full json.loads and a 15-key dict per game."""
+    data = json.loads(content)
+    is_cricket = sport in CRICKET_SPORTS
+    games = []
+    for event in data.get("events", []):
+        event_date = event.get("date", "")
+        if not _legacy_is_recent(event_date):
+            continue
+        competitors = event["competitions"][0]["competitors"]
+        home, away = competitors[0], competitors[1]
+        game_data: dict[str, Any] = {
+            "id": event.get("id", ""),
+            "name": event.get("name", ""),
+            "status": event.get("status", {}).get("type", {}).get("description", ""),
+            "home_team": home["team"]["displayName"],
+            "home_abbreviation": home["team"].get("abbreviation", ""),
+            "home_score": home.get("score", "0"),
+            "home_logo": home["team"].get("logo", ""),
+            "home_color": home["team"].get("color", ""),
+            "away_team": away["team"]["displayName"],
+            "away_abbreviation": away["team"].get("abbreviation", ""),
+            "away_score": away.get("score", "0"),
+            "away_logo": away["team"].get("logo", ""),
+            "away_color": away["team"].get("color", ""),
+            "start_time": event_date,
+            "is_cricket": is_cricket,
+        }
+        if is_cricket:
+            for prefix, competitor in [("home", home), ("away", away)]:
+                innings_list = []
+                for inn in competitor.get("linescores", []):
+                    runs, wickets, overs = inn.get("runs", 0), inn.get("wickets", 0), inn.get("overs", 0)
+                    if runs or wickets or overs:
+                        if wickets == 10 or inn.get("description", "") == "all out":
+                            innings_list.append(f"{runs}")
+                        else:
+                            innings_list.append(f"{runs}/{wickets}")
+                game_data[f"{prefix}_innings"] = innings_list
+        games.append(game_data)
+    STATUS_ORDER = {"In Progress": 0, "Halftime": 0, "Scheduled": 1, "Final": 2, "Result": 2}
+    games.sort(key=lambda g: (STATUS_ORDER.get(g["status"], 1), g.get("start_time", "")))
+    return games
+
+
+def _time(fn, content, sport) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(content, sport)
+    return (time.perf_counter() - start) / ROUNDS * 1e3
+
+
+def _retained(fn, content, sport) -> int:
+    tracemalloc.start()
+    result = fn(content, sport)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    print(f"{'sport':>8} {'events':>6} {'KB':>6} {'legacy_ms':>9} {'new_ms':>7} {'legacy_KB':>9} {'new_KB':>7}")
+    for sport, events in EVENT_COUNTS.items():
+        content = scoreboard_bytes(sport)
+        assert [g.to_dict() for g in parse_scoreboard(content, sport)] == legacy_parse(content, sport)
+        print(f"{sport:>8} {events:>6} {len(content) // 1024:>6} "
+              f"{_time(legacy_parse, content, sport):>9.3f} {_time(parse_scoreboard, content, sport):>7.3f} "
+              f"{_retained(legacy_parse, content, sport) // 1024:>9} "
+              f"{_retained(parse_scoreboard, content, sport) // 1024:>7}")
+
+
+if __name__ == "__main__":
+    main()
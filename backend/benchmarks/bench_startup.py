@@ -0,0 +1,185 @@
+"""Cold-start time and first-request latency of the API process.
+
+Each trial starts a fresh Python process that imports ``main``, serves the
+app under uvicorn and sends two /api/chat requests. ESPN and Gemini are
+replaced by a local HTTP server (the real ``google.genai`` client is pointed
+at it through GOOGLE_GEMINI_BASE_URL), so client construction, imports and
+connection setup are all on the measured path; only real TLS handshakes are
+missing.
+
+Reports, per trial:
+- ``import``: time to import ``main``
+- ``listening``: process start until /api/health answers
+- ``ready``: process start until /api/ready answers 200 (same as listening on trees without it)
+- ``first_ttft`` / ``second_ttft``: time to the first text of the first and second chat
+
+    python -m benchmarks.bench_startup --trials 5
+    python -m benchmarks.bench_startup --app-dir /path/to/other/checkout/backend
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# --- Local upstream standing in for ESPN and Gemini (runs in the parent) ---
+
+def _upstream_app(chunks: int, ttft: float, interval: float):
+    from starlette.applications import Starlette
+    from starlette.responses import Response, StreamingResponse
+    from starlette.routing import Route
+
+    sys.path.insert(0, str(HERE.parent))
+    from benchmarks.fixtures import scoreboard_bytes
+
+    scoreboard = scoreboard_bytes("nba")
+
+    async def espn(request):
+        return Response(scoreboard, media_type="application/json")
+
+    async def gemini(request):
+        async def stream():
+            await asyncio.sleep(ttft)
+            for i in range(chunks):
+                payload = {"candidates": [{"content": {"role": "model", "parts": [{"text": f"token{i} "}]}}]}
+                yield f"data: {json.dumps(payload)}\r\n\r\n".encode()
+                await asyncio.sleep(interval)
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def root(request):
+        return Response("ok")
+
+    return Starlette(routes=[
+        Route("/apis/site/v2/sports/{path:path}", espn),
+        Route("/{version}/models/{model}:streamGenerateContent", gemini, methods=["POST"]),
+        Route("/{path:path}", root, methods=["GET", "HEAD"]),
+    ])
+
+
+def _start_upstream(port: int, args: argparse.Namespace) -> None:
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(_upstream_app(args.chunks, args.ttft, args.interval),
+                                           host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+# --- Child process: one cold start ---
+
+async def _first_text(client, message: str) -> float:
+    start = time.perf_counter()
+    elapsed = None
+    async with client.stream("POST", "/api/chat", json={"messages": [{"role": "user", "content": message}]}) as r:
+        sse = r.headers.get("content-type", "").startswith("text/event-stream")
+        async for chunk in r.aiter_raw():
+            if elapsed is None and chunk and (not sse or b'"text"' in chunk):
+                elapsed = time.perf_counter() - start
+    if elapsed is None:
+        raise RuntimeError(f"no text in /api/chat response ({r.status_code})")
+    return elapsed
+
+
+async def _wait_for(client, path: str, process_start: float) -> float:
+    """Seconds from process start until ``path`` answers 200 (or 404: the tree has no such check)."""
+    import httpx
+
+    while True:
+        try:
+            response = await client.get(path)
+            if response.status_code in (200, 404):
+                return time.time() - process_start
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.01)
+
+
+async def _child(upstream: str, process_start: float) -> dict[str, float]:
+    import logging
+
+    import httpx
+    import uvicorn
+
+    t = time.perf_counter()
+    import main
+    from services import sports_service
+    imported = time.perf_counter() - t
+
+    logging.getLogger("sportsgpt").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sports_service.BASE_URL = f"{upstream}/apis/site/v2/sports"
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+        listening = await _wait_for(client, "/api/health", process_start)
+        ready = await _wait_for(client, "/api/ready", process_start)
+        first = await _first_text(client, "nba scores tonight")
+        second = await _first_text(client, "what were the nba scores tonight")
+    server.should_exit = True
+    await serve_task
+    return {"import": imported, "listening": listening, "ready": max(listening, ready),
+            "first_ttft": first, "second_ttft": second}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--app-dir", default=str(HERE.parent), help="backend directory to measure")
+    parser.add_argument("--ttft", type=float, default=0.2, help="fake Gemini time to first token")
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        os.chdir(args.app_dir)
+        sys.path.insert(0, args.app_dir)
+        result = asyncio.run(_child(args.child, float(os.environ["BENCH_PROCESS_START"])))
+        print(json.dumps(result))
+        return
+
+    port = _free_port()
+    _start_upstream(port, args)
+    upstream = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "GOOGLE_GEMINI_BASE_URL": upstream,
+        "GEMINI_API_KEY": "bench",
+        "TAVILY_API_KEY": "",
+        "SUPABASE_URL": "",
+        "CACHE_REDIS_URL": "",
+    }
+
+    results = []
+    for _ in range(args.trials):
+        env["BENCH_PROCESS_START"] = repr(time.time())
+        out = subprocess.run([sys.executable, __file__, "--child", upstream, "--app-dir", args.app_dir],
+                             env=env, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"app: {args.app_dir}  ({args.trials} trials, median / max, ms)")
+    for key in ("import", "listening", "ready", "first_ttft", "second_ttft"):
+        values = [r[key] * 1000 for r in results]
+        print(f"  {key:<12} {statistics.median(values):>8.0f} {max(values):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Deterministic ESPN-shaped scoreboard payloads for benchmarks and fake upstreams.
+
+The payloads mirror the structure of ESPN's site API scoreboard responses,
+including the many fields we do not read (venues, broadcasts, odds, leaders,
+links), so parsing cost and payload size are realistic.
+"""
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+# Events per sport, roughly what ESPN returns on a busy day
+EVENT_COUNTS = {"nba": 12, "nfl": 16, "soccer": 10, "ncaab": 180, "ipl": 2, "cricket": 6}
+
+STATUSES = [
+    ("STATUS_FINAL", "Final", True),
+    ("STATUS_IN_PROGRESS", "In Progress", False),
+    ("STATUS_SCHEDULED", "Scheduled", False),
+]
+
+
+def _team(rng: random.Random, i: int) -> dict:
+    name = f"Team{i}"
+    return {
+        "id": str(i),
+        "uid": f"s:40~l:46~t:{i}",
+        "location": f"City{i}",
+        "name": name,
+        "abbreviation": f"T{i:02d}"[:4],
+        "displayName": f"City{i} {name}",
+        "shortDisplayName": name,
+        "color": f"{rng.randrange(0xFFFFFF):06x}",
+        "alternateColor": f"{rng.randrange(0xFFFFFF):06x}",
+        "isActive": True,
+        "venue": {"id": str(1000 + i)},
+        "links": [{"rel": ["clubhouse", "desktop", "team"], "href": f"https://www.espn.com/team/_/id/{i}",
+                   "text": "Clubhouse", "isExternal": False, "isPremium": False}] * 4,
+        "logo": f"https://a.espncdn.com/i/teamlogos/{i}.png",
+    }
+
+
+def _competitor(rng: random.Random, team_id: int, home: bool, cricket: bool) -> dict:
+    competitor = {
+        "id": str(team_id),
+        "uid": f"s:40~l:46~t:{team_id}",
+        "type": "team",
+        "order": 0 if home else 1,
+        "homeAway": "home" if home else "away",
+        "winner": rng.random() > 0.5,
+        "team": _team(rng, team_id),
+        "score": str(rng.randrange(0, 130)),
+        "statistics": [{"name": f"stat{k}", "abbreviation": f"S{k}", "displayValue": str(rng.random())}
+                       for k in range(8)],
+        "leaders": [{"name": "points", "displayName": "Points Leader",
+                     "leaders": [{"displayValue": "30 PTS", "value": 30.0,
+                                  "athlete": {"id": "1", "fullName": "Some Player",
+                                              "headshot": "https://a.espncdn.com/h.png"}}]}] * 3,
+        "records": [{"name": "overall", "type": "total", "summary": "10-5"}] * 3,
+    }
+    if cricket:
+        competitor["linescores"] = [
+            {"period": p, "runs": rng.randrange(80, 400), "wickets": rng.randrange(0, 11),
+             "overs": round(rng.uniform(10, 90), 1), "description": "all out" if p == 1 else "",
+             "isBatting": p == 2}
+            for p in (1, 2)
+        ]
+    return competitor
+
+
+def build_scoreboard(sport: str, events: int | None = None, seed: int = 7, day: datetime | None = None) -> dict:
+    rng = random.Random(f"{sport}-{seed}")
+    cricket = sport in ("ipl", "cricket")
+    day = day or datetime.now(timezone.utc)
+    payload_events = []
+    for n in range(events if events is not None else EVENT_COUNTS.get(sport, 10)):
+        state, description, completed = STATUSES[n % len(STATUSES)]
+        start = day - timedelta(hours=rng.randrange(0, 30))
+        home, away = 2 * n + 1, 2 * n + 2
+        payload_events.append({
+            "id": f"{sport}{n:04d}",
+            "uid": f"s:40~l:46~e:{n}",
+            "date": start.strftime("%Y-%m-%dT%H:%MZ"),
+            "name": f"City{away} Team{away} at City{home} Team{home}",
+            "shortName": f"T{away} @ T{home}",
+            "season": {"year": day.year, "type": 2, "slug": "regular-season"},
+            "competitions": [{
+                "id": f"{sport}{n:04d}",
+                "date": start.strftime("%Y-%m-%dT%H:%MZ"),
+                "attendance": rng.randrange(10000, 20000),
+                "venue": {"id": str(home), "fullName": f"Arena {home}",
+                          "address": {"city": f"City{home}", "state": "XX"}, "indoor": True},
+                "competitors": [
+                    _competitor(rng, home, True, cricket),
+                    _competitor(rng, away, False, cricket),
+                ],
+                "notes": [],
+                "broadcasts": [{"market": "national", "names": ["ESPN", "ABC"]}],
+                "odds": [{"provider": {"name": "Book"}, "details": "T1 -3.5", "overUnder": 220.5}],
+                "status": {"clock": 0.0, "displayClock": "0:00", "period": 4,
+                           "type": {"id": "3", "name": state, "state": "post",
+                                    "completed": completed, "description": description}},
+            }],
+            "links": [{"href": f"https://www.espn.com/game/_/gameId/{n}", "text": "Gamecast"}] * 5,
+            "status": {"clock": 0.0, "displayClock": "0:00", "period": 4,
+                       "type": {"id": "3", "name": state, "state": "post",
+                                "completed": completed, "description": description}},
+        })
+    return {"leagues": [{"id": "46", "name": sport.upper()}], "events": payload_events}
+
+
+def scoreboard_bytes(sport: str, **kwargs) -> bytes:
+    return json.dumps(build_scoreboard(sport, **kwargs)).encode()
@@ -0,0 +1,268 @@
+"""Local stand-ins for ESPN, Tavily, Gemini and Supabase.
+
+Each stand-in has configurable latency so the API can be load-tested without
+network access or API quota. ``install`` puts them in the resource registry
+in place of the real clients:
+
+- ESPN scoreboards and RSS feeds are served by an ``httpx.MockTransport``
+  replaying fixtures: recorded ``<sport>.json`` scoreboards from a directory
+  when given, otherwise the synthetic payloads from ``fixtures``.
+- Tavily is a stub ``search`` coroutine returning canned results.
+- Gemini streams tokens after a time-to-first-token delay at a fixed rate.
+- Supabase is an in-memory PostgREST table store supporting the query
+  builder calls ``db_service`` makes.
+"""
+import asyncio
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+from benchmarks.fixtures import scoreboard_bytes
+from services import news_service, resources, sports_service
+
+
+# --- ESPN scoreboards and news feeds ---
+
+def _rss_feed(name: str, items: int = 20) -> bytes:
+    entries = "".join(
+        f"<item><title>{name} headline {i}</title>"
+        f"<link>https://www.espn.com/{name}/story/_/id/{i}</link>"
+        f"<description>Summary of {name} story {i}.</description>"
+        f"<pubDate>Sat, 17 Oct 2026 {i % 24:02d}:00:00 GMT</pubDate></item>"
+        for i in range(items)
+    )
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>ESPN {name}</title>'
+            f"{entries}</channel></rss>").encode()
+
+
+class FakeESPN:
+    """Serves scoreboards and RSS feeds from fixtures after ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.05, fixtures_dir: Optional[Path] = None):
+        self.latency = latency
+        self.requests = 0
+        sports = {endpoint: sport for sport, endpoint in sports_service.SPORT_ENDPOINTS.items()}
+        self._scoreboards = {}
+        for endpoint, sport in sports.items():
+            recorded = fixtures_dir / f"{sport}.json" if fixtures_dir else None
+            if recorded is not None and recorded.exists():
+                self._scoreboards[endpoint] = recorded.read_bytes()
+            else:
+                self._scoreboards[endpoint] = scoreboard_bytes(sport)
+        self._feeds = {httpx.URL(url).path: _rss_feed(name) for name, url in news_service.ESPN_RSS_FEEDS.items()}
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        path = request.url.path
+        if path.endswith("/scoreboard"):
+            endpoint = path.split("/sports/", 1)[-1].rsplit("/scoreboard", 1)[0]
+            body = self._scoreboards.get(endpoint)
+            if body is not None:
+                return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+        feed = self._feeds.get(path)
+        if feed is not None:
+            etag = '"' + hashlib.md5(feed).hexdigest() + '"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            return httpx.Response(200, content=feed, headers={"ETag": etag, "Content-Type": "application/rss+xml"})
+        return httpx.Response(404)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle), timeout=10)
+
+
+# --- Tavily ---
+
+class FakeTavily:
+    def __init__(self, latency: float = 0.4):
+        self.latency = latency
+        self.requests = 0
+
+    async def search(self, query: str, max_results: int = 5, **kwargs: Any) -> dict[str, Any]:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return {
+            "answer": f"Stand-in answer for {query}.",
+            "results": [
+                {"title": f"Result {i}", "url": f"https://example.com/{i}", "content": "Recent sports news. " * 20}
+                for i in range(max_results)
+            ],
+        }
+
+
+# --- Gemini ---
+
+class _Chunk:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, gemini: "FakeGemini"):
+        self._gemini = gemini
+
+    async def generate_content_stream(self, **kwargs: Any):
+        gemini = self._gemini
+        gemini.requests += 1
+
+        async def stream():
+            await asyncio.sleep(gemini.ttft)
+            interval = 1 / gemini.tokens_per_second
+            for i in range(gemini.tokens):
+                if i:
+                    await asyncio.sleep(interval)
+                yield _Chunk(f"token{i} ")
+        return stream()
+
+    async def generate_content(self, **kwargs: Any):
+        self._gemini.requests += 1
+        await asyncio.sleep(self._gemini.ttft)
+        return _Chunk("Stand-in summary of the earlier conversation.")
+
+
+class FakeGemini:
+    """Streams ``tokens`` chunks: the first after ``ttft`` seconds, then ``tokens_per_second``."""
+
+    def __init__(self, ttft: float = 0.5, tokens_per_second: float = 80.0, tokens: int = 60):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.tokens = tokens
+        self.requests = 0
+        self.aio = type("aio", (), {"models": _FakeModels(self)})()
+
+
+# --- Supabase (PostgREST) ---
+
+class _Result:
+    def __init__(self, data: list[dict[str, Any]]):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self._db = db
+        self._table = table
+        self._action = "select"
+        self._payload: Any = None
+        self._columns: Optional[list[str]] = None
+        self._filters: list = []
+        self._order: Optional[tuple[str, bool]] = None
+        self._limit: Optional[int] = None
+
+    def select(self, columns: str = "*") -> "_Query":
+        self._action = "select"
+        self._columns = None if columns == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, rows: Any) -> "_Query":
+        self._action, self._payload = "insert", rows
+        return self
+
+    def update(self, values: dict[str, Any]) -> "_Query":
+        self._action, self._payload = "update", values
+        return self
+
+    def delete(self) -> "_Query":
+        self._action = "delete"
+        return self
+
+    def eq(self, column: str, value: Any) -> "_Query":
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column: str, values: list[Any]) -> "_Query":
+        allowed = set(values)
+        self._filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "_Query":
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count: int) -> "_Query":
+        self._limit = count
+        return self
+
+    async def execute(self) -> _Result:
+        self._db.requests += 1
+        await asyncio.sleep(self._db.latency)
+        rows = self._db.tables.setdefault(self._table, [])
+        if self._action == "insert":
+            now = datetime.now(timezone.utc).isoformat()
+            new = [{"id": str(uuid.uuid4()), "created_at": now, "updated_at": now, **row}
+                   for row in (self._payload if isinstance(self._payload, list) else [self._payload])]
+            rows.extend(new)
+            return _Result(new)
+
+        matched = [row for row in rows if all(f(row) for f in self._filters)]
+        if self._action == "update":
+            for row in matched:
+                row.update(self._payload)
+        elif self._action == "delete":
+            self._db.tables[self._table] = [row for row in rows if row not in matched]
+        else:
+            if self._order is not None:
+                column, desc = self._order
+                matched.sort(key=lambda row: row.get(column) or "", reverse=desc)
+            if self._limit is not None:
+                matched = matched[:self._limit]
+            if self._columns is not None:
+                matched = [{c: row.get(c) for c in self._columns} for row in matched]
+        return _Result([dict(row) for row in matched])
+
+
+class _FakePostgrest:
+    async def aclose(self) -> None:
+        pass
+
+
+class FakeSupabase:
+    """In-memory tables behind the subset of the PostgREST builder ``db_service`` uses."""
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.requests = 0
+        self.tables: dict[str, list[dict[str, Any]]] = {}
+        self.postgrest = _FakePostgrest()
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+
+class StandIns:
+    def __init__(self, espn: FakeESPN, tavily: FakeTavily, gemini: FakeGemini, supabase: FakeSupabase):
+        self.espn = espn
+        self.tavily = tavily
+        self.gemini = gemini
+        self.supabase = supabase
+
+    def request_counts(self) -> dict[str, int]:
+        return {
+            "espn": self.espn.requests,
+            "tavily": self.tavily.requests,
+            "gemini": self.gemini.requests,
+            "supabase": self.supabase.requests,
+        }
+
+
+def install(
+    espn: Optional[FakeESPN] = None,
+    tavily: Optional[FakeTavily] = None,
+    gemini: Optional[FakeGemini] = None,
+    supabase: Optional[FakeSupabase] = None,
+) -> StandIns:
+    """Register stand-ins as the shared clients. Call from the event loop that will serve requests."""
+    stand_ins = StandIns(espn or FakeESPN(), tavily or FakeTavily(), gemini or FakeGemini(),
+                         supabase or FakeSupabase())
+    resources._http = stand_ins.espn.client()
+    resources._search = stand_ins.tavily
+    resources._gemini = stand_ins.gemini
+    resources._supabase = stand_ins.supabase
+    return stand_ins
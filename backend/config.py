@@ -10,8 +10,114 @@ class Settings(BaseSettings):
     port: int = 8000
     supabase_url: str = ""
     supabase_service_role_key: str = ""
+    # Legacy HS256 JWT secret; projects on asymmetric keys verify via JWKS instead
+    supabase_jwt_secret: str = ""
+    jwks_refresh_interval: float = 600
+    auth_cache_size: int = 10000
     tavily_api_key: str = ""
 
+    # Scoreboard cache TTLs (seconds)
+    scores_live_ttl: float = 15
+    scores_idle_ttl: float = 120
+    scores_stale_ttl: float = 300
+    # Scoreboards cached per sport and per (sport, day) asked about in chat
+    scoreboard_cache_size: int = 500
+    # Multi-sport /api/scores bodies kept for reuse, by (sports, dates)
+    scores_body_cache_size: int = 256
+    # Most scoreboards (sports x days) one dated /api/scores request may ask for
+    scores_max_sport_days: int = 28
+
+    # Response compression for cached bodies (brotli is optional)
+    compress_min_bytes: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 6
+
+    # Background scoreboard poller intervals (seconds)
+    poller_live_interval: float = 10
+    poller_idle_interval: float = 120
+
+    # SQLite file holding scoreboards of finished days
+    scores_archive_path: str = "scores_archive.db"
+    # Archived days also kept in memory
+    scores_archive_memory_size: int = 500
+
+    # Overall latency budget for gathering chat context (seconds)
+    context_budget_seconds: float = 2.5
+
+    # Write-behind persistence of chat messages
+    db_flush_interval: float = 0.5
+    db_flush_batch_size: int = 200
+    db_max_pending_writes: int = 10000
+
+    # Read-through cache for conversation lists and message history
+    conversation_cache_size: int = 2000
+    # Hot histories for chats that send only the new message (conversations per worker)
+    session_store_size: int = 1000
+    # Optional Redis URL so every worker sees the same cache invalidations
+    cache_redis_url: str = ""
+    # Set when the app runs as one process; hot sessions are then kept
+    # without cache_redis_url
+    single_worker: bool = False
+
+    # Prompt token budget; older turns beyond it are summarized or dropped
+    prompt_token_budget: int = 8000
+    summary_max_tokens: int = 300
+    summary_cache_size: int = 5000
+    # Messages that must fall out of the window before a summary is regenerated
+    summary_refresh_messages: int = 6
+    # Cap on the live scores block injected into the prompt
+    scores_context_token_budget: int = 1200
+
+    # Extra intent keywords, e.g. {"nba": ["knicks"], "search": ["mvp"]}
+    intent_extra_keywords: dict[str, list[str]] = {}
+    # How often team names are re-read from the scoreboards (seconds)
+    entity_index_refresh_interval: float = 1800
+
+    # Web search result cache
+    search_cache_ttl: float = 600
+    search_cache_size: int = 1000
+
+    # How often the news aggregator re-polls the RSS feeds (seconds)
+    news_refresh_interval: float = 300
+
+    # Opt-in cache of first-turn answers, keyed on question + context fingerprint
+    answer_cache_enabled: bool = False
+    answer_cache_size: int = 500
+    answer_cache_ttl: float = 1800
+    answer_replay_interval: float = 0.02
+
+    # Resumable chat streams: generations kept for Last-Event-ID reconnects
+    chat_stream_buffer_size: int = 500
+    chat_stream_retention: float = 300
+    # How long a generation keeps running with no client attached (seconds)
+    chat_stream_grace_period: float = 20
+    chat_stream_heartbeat: int = 15
+
+    # Admission control for concurrent chat generations per worker
+    chat_max_concurrent: int = 32
+    chat_max_queued: int = 64
+    # Longest a request may wait for a slot before it is shed (seconds)
+    chat_queue_budget: float = 2.0
+    # Share of slots in use at which chat starts skipping web search
+    chat_degrade_at: float = 0.75
+    # Cheaper generation once requests have to queue
+    degraded_max_output_tokens: int = 512
+    degraded_scores_token_budget: int = 400
+    # After Gemini rate-limits us, shed new chats with 429 for this long (seconds)
+    gemini_rate_limit_cooldown: float = 10
+
+    # Per-upstream circuit breakers: consecutive failures that open one, and for how long (seconds)
+    upstream_failure_threshold: int = 5
+    upstream_open_seconds: float = 30
+    # Idempotent GETs send a second request after the upstream's p95 latency, within these bounds
+    hedge_min_delay: float = 0.05
+    hedge_max_delay: float = 2.0
+
+    # Register the static system prompt as explicit Gemini cached content
+    # (the model has a minimum cacheable size; below it requests fall back to implicit caching)
+    gemini_prefix_cache: bool = False
+    gemini_prefix_cache_ttl: int = 3600
+
     @field_validator("cors_origins")
     @classmethod
     def parse_cors_origins(cls, v: str) -> str:
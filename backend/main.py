@@ -1,10 +1,21 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from config import settings
-from routers import chat, scores, conversations, news
+from routers import chat, scores, conversations, news, metrics
+from services.auth_service import start_jwks_refresh, stop_jwks_refresh
+from services.cache_service import start_invalidation_bus, stop_invalidation_bus
+from services.chat_streams import stop_streams
+from services import resources, upstream
+from services.db_service import start_writer, stop_writer
+from services.entity_index import start_entity_index, stop_entity_index
+from services.news_service import start_aggregator, stop_aggregator
+from services.score_archive import close_archive
+from services.score_poller import start_poller, stop_poller
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,7 +23,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sportsgpt")
 
-app = FastAPI(title="SportsGPT API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    resources.start_resources()
+    await start_invalidation_bus(settings.cache_redis_url)
+    start_poller()
+    start_writer()
+    start_aggregator()
+    start_entity_index()
+    start_jwks_refresh()
+    yield
+    await stop_streams()
+    await stop_jwks_refresh()
+    await stop_entity_index()
+    await stop_aggregator()
+    await stop_poller()
+    close_archive()
+    # Drain queued chat messages before the process exits
+    await stop_writer()
+    await resources.stop_resources()
+    await stop_invalidation_bus()
+
+
+app = FastAPI(title="SportsGPT API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,10 +60,25 @@ app.include_router(chat.router, prefix="/api")
 app.include_router(scores.router, prefix="/api")
 app.include_router(conversations.router, prefix="/api")
 app.include_router(news.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 logger.info("SportsGPT API started. CORS origins: %s", settings.cors_origins_list)
 
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok"}
+    """Liveness, plus whether the shared clients and connections are warmed up."""
+    return {"status": "ok", **resources.get_status()}
+
+
+@app.get("/api/ready")
+async def ready():
+    """503 until startup warm-up has finished, for load balancer readiness checks."""
+    status = resources.get_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/api/upstreams")
+async def upstream_stats():
+    """Circuit breaker state and hedging counters per upstream."""
+    return upstream.get_upstream_stats()
@@ -1,14 +1,26 @@
+import json
 import logging
+import math
+from contextlib import aclosing
 from typing import Optional
 
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Request
 from pydantic import BaseModel
-
-from services.claude_service import stream_chat_response
-from services.sports_service import get_live_scores
-from services.search_service import web_search
-from services.db_service import save_message, update_conversation_title
+from sse_starlette.sse import EventSourceResponse
+
+from config import settings
+from routers.conversations import get_current_user
+from services import session_store
+from services.admission import NORMAL, REDUCED, Overloaded, Slot, chat_admission
+from services.answer_cache import answer_key, get_answer, replay_answer, store_answer
+from services.chat_streams import ChatStream, StreamFailed, get_stream, parse_last_event_id, start_stream
+from services.claude_service import is_rate_limited, stream_chat_response, unavailable_for
+from services.context_service import gather_context
+from services.date_parser import parse_date_range
+from services.db_service import queue_message, queue_title
+from services.intent_service import match_intent
+from services.scores_context import build_scores_context
+from services.upstream import CircuitOpen
 
 
 logger = logging.getLogger("sportsgpt.chat")
@@ -21,75 +33,94 @@ class Message(BaseModel):
 
 
 class ChatRequest(BaseModel):
-    messages: list[Message]
+    """Either the full history in ``messages``, or just the new ``message`` of a
+    saved conversation, whose history the server keeps (requires auth)."""
+    messages: list[Message] = []
     conversation_id: Optional[str] = None
-
-
-# Map keywords to sport identifiers
-SPORT_KEYWORDS: dict[str, list[str]] = {
-    "nfl": ["nfl", "football", "touchdown", "quarterback", "super bowl"],
-    "nba": ["nba", "basketball", "lakers", "celtics", "warriors", "dunk"],
-    "mlb": ["mlb", "baseball", "home run", "pitcher", "world series"],
-    "nhl": ["nhl", "hockey", "puck", "stanley cup"],
-    "soccer": ["soccer", "football", "premier league", "epl", "goal", "messi", "ronaldo", "fifa"],
-    "ncaaf": ["college football", "ncaaf", "cfb"],
-    "ncaab": ["college basketball", "ncaab", "march madness"],
-    "cricket": ["cricket", "test match", "odi", "t20", "wicket", "batsman", "bowler", "innings"],
-    "ipl": ["ipl", "indian premier league"],
-    "bbl": ["bbl", "big bash"],
-    "psl": ["psl", "pakistan super league"],
-    "cpl": ["cpl", "caribbean premier league"],
-    "the_hundred": ["the hundred", "hundred cricket"],
-    "sa20": ["sa20"],
-    "county": ["county cricket", "county championship"],
-}
+    message: Optional[str] = None
 
 
 def detect_sports(text: str) -> list[str]:
-    text_lower = text.lower()
-    detected = []
-
-    score_keywords = ["score", "scores", "game", "games", "playing", "play today",
-                      "who won", "who's winning", "result", "results", "live",
-                      "today", "tonight", "yesterday", "this week", "standings"]
-    is_score_query = any(kw in text_lower for kw in score_keywords)
-
-    if not is_score_query:
-        return []
-
-    for sport, keywords in SPORT_KEYWORDS.items():
-        if any(kw in text_lower for kw in keywords):
-            detected.append(sport)
-
-    return detected
-
-
-def format_scores_context(scores_data: list[dict]) -> str:
-    parts = []
-    for data in scores_data:
-        sport = data.get("sport", "").upper()
-        games = data.get("games", [])
-        if not games:
-            parts.append(f"\n{sport}: No games currently scheduled.")
-            continue
-
-        parts.append(f"\n{sport} Scores:")
-        for game in games:
-            status = game["status"]
-            home = game["home_team"]
-            away = game["away_team"]
-            home_score = game["home_score"]
-            away_score = game["away_score"]
-            parts.append(f"  {away} {away_score} @ {home} {home_score} ({status})")
-
-    return "\n".join(parts)
+    intent = match_intent(text)
+    return intent.sports if intent.is_score_query else []
+
+
+def _event_stream(stream: ChatStream, after: int = 0) -> EventSourceResponse:
+    """SSE for a chat stream: a ``stream`` event, one event per chunk, then ``done``.
+
+    Event ids are ``<stream_id>:<n>``, so a client that reconnects with
+    Last-Event-ID gets the chunks after ``n`` and then follows the live generation.
+    """
+    async def events():
+        yield {"event": "stream", "id": f"{stream.id}:{after}", "data": json.dumps({"stream_id": stream.id})}
+        async for position, chunk in stream.follow(after):
+            yield {"id": f"{stream.id}:{position}", "data": json.dumps({"text": chunk})}
+        if stream.error is not None:
+            yield {"event": "error", "data": json.dumps(stream.error)}
+        elif stream.cancelled:
+            yield {"event": "error", "data": json.dumps({"message": "Generation was cancelled"})}
+        else:
+            yield {"event": "done", "data": "{}"}
+
+    return EventSourceResponse(events(), ping=settings.chat_stream_heartbeat,
+                               headers={"X-Stream-Id": stream.id})
+
+
+async def _load_messages(request: ChatRequest, http_request: Request) -> tuple[list[dict], Optional[str]]:
+    """The conversation so far plus the new message, and the user it belongs to if known."""
+    if request.message is None:
+        return [{"role": m.role, "content": m.content} for m in request.messages], None
+    if not request.conversation_id:
+        raise HTTPException(status_code=422, detail="conversation_id is required when sending only the new message")
+    user_id = await get_current_user(http_request)
+    history = await session_store.get_history(user_id, request.conversation_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return history + [{"role": "user", "content": request.message}], user_id
 
 
 @router.post("/chat")
-async def chat(request: ChatRequest):
-    messages = [{"role": m.role, "content": m.content} for m in request.messages]
-    conversation_id = request.conversation_id
-
+async def chat(
+    request: ChatRequest,
+    http_request: Request,
+    last_event_id: Optional[str] = Header(default=None),
+):
+    # A retried request that carries Last-Event-ID resumes the generation it already started
+    resume = parse_last_event_id(last_event_id)
+    if resume:
+        stream = get_stream(resume[0])
+        if stream is not None:
+            logger.info("Resuming chat stream %s after event %d", *resume)
+            return _event_stream(stream, resume[1])
+
+    # Don't queue or gather context for a generation that cannot start
+    retry_after = unavailable_for()
+    if retry_after:
+        raise HTTPException(status_code=503, detail="The model is temporarily unavailable, retry shortly",
+                            headers={"Retry-After": str(math.ceil(retry_after))})
+
+    # Before admission, so a slot is not held while history loads
+    messages, user_id = await _load_messages(request, http_request)
+
+    try:
+        slot = await chat_admission.acquire()
+    except Overloaded as e:
+        raise HTTPException(status_code=e.status_code, detail=f"Server busy ({e.reason}), retry shortly",
+                            headers={"Retry-After": str(e.retry_after)})
+    try:
+        return await _chat(messages, request.conversation_id, user_id, slot)
+    except BaseException:
+        # The slot is normally released when the generation finishes
+        slot.release()
+        raise
+
+
+async def _chat(
+    messages: list[dict],
+    conversation_id: Optional[str],
+    user_id: Optional[str],
+    slot: Slot,
+) -> EventSourceResponse:
     scores_context = ""
     latest_user_msg = ""
     if messages:
@@ -101,54 +132,104 @@ async def chat(request: ChatRequest):
     logger.info("Chat request: conv=%s, msg_count=%d, user_msg='%s'",
                 conversation_id or "none", len(messages), latest_user_msg[:100])
 
-    sports = detect_sports(latest_user_msg)
+    intent = match_intent(latest_user_msg)
+    sports = intent.sports if intent.is_score_query else []
     if sports:
         logger.info("Detected sports: %s", sports)
-        scores_results = []
-        for sport in sports:
-            try:
-                result = await get_live_scores(sport)
-                if "error" not in result:
-                    scores_results.append(result)
-                    logger.info("Fetched %d games for %s", len(result.get("games", [])), sport)
-            except Exception as e:
-                logger.warning("Failed to fetch scores for %s: %s", sport, e)
-
-        if scores_results:
-            scores_context = format_scores_context(scores_results)
-
-    # Web search for current events / recent info
-    search_context = ""
-    SEARCH_KEYWORDS = ["who won", "latest", "recent", "current", "news", "trade",
-                       "injury", "update", "transfer", "rumor", "champion", "winner",
-                       "standings", "ranking", "draft", "signing", "contract",
-                       "fired", "hired", "coach", "manager", "2025", "2026"]
-    if any(kw in latest_user_msg.lower() for kw in SEARCH_KEYWORDS):
-        search_context = await web_search(latest_user_msg)
+
+    # Web search for current events / recent info; the first thing dropped under load
+    search_query = latest_user_msg if intent.is_search_query and slot.level == NORMAL else ""
+    if slot.level != NORMAL:
+        logger.info("Degraded chat (level %d): search=%s", slot.level, "skipped" if intent.is_search_query else "n/a")
+
+    # "yesterday's results" or "this week's games" need those days' scoreboards
+    dates = parse_date_range(latest_user_msg) if sports else None
+    if dates:
+        logger.info("Scoreboard dates: %s to %s", *dates)
+
+    scores_results, search_context = await gather_context(sports, search_query, dates)
+    if scores_results:
+        scores_context = build_scores_context(
+            scores_results, latest_user_msg,
+            settings.degraded_scores_token_budget if slot.level == REDUCED else None,
+        )
+
+    # Repeated first-turn questions can be answered from the answer cache
+    cache_key = None
+    cached_answer = None
+    if settings.answer_cache_enabled and len(messages) == 1:
+        cache_key = answer_key(latest_user_msg, scores_context, search_context)
+        cached_answer = get_answer(cache_key)
 
     full_response = []
 
-    async def event_generator():
+    async def generate():
+        # Runs in its own task (see chat_streams), so it outlives a dropped connection
         try:
-            async for chunk in stream_chat_response(messages, scores_context, search_context):
-                full_response.append(chunk)
-                yield chunk
+            if cached_answer is not None:
+                logger.info("Answer cache hit, replaying %d chunks", len(cached_answer))
+                source = replay_answer(cached_answer)
+            else:
+                source = stream_chat_response(
+                    messages, scores_context, search_context, conversation_id,
+                    sport=sports[0] if sports else "none",
+                    max_output_tokens=settings.degraded_max_output_tokens if slot.level == REDUCED else 1024,
+                    user_id=user_id,
+                )
+            # Cancelling the generation (nobody reconnected in time) closes the upstream Gemini stream
+            async with aclosing(source) as stream:
+                async for chunk in stream:
+                    full_response.append(chunk)
+                    yield chunk
             logger.info("Gemini response complete, %d chars", len("".join(full_response)))
+            # Shortened answers from a degraded request are not worth caching
+            if cache_key is not None and cached_answer is None and slot.level != REDUCED:
+                store_answer(cache_key, full_response)
         except Exception as e:
+            if isinstance(e, CircuitOpen) and not full_response:
+                raise StreamFailed(503, "The model is temporarily unavailable, please retry shortly",
+                                   retry_after=math.ceil(e.retry_after))
+            if is_rate_limited(e) and not full_response:
+                # Report it as a retryable 429 rather than error text in the answer
+                chat_admission.note_rate_limited()
+                raise StreamFailed(429, "The model is busy, please retry shortly",
+                                   retry_after=int(settings.gemini_rate_limit_cooldown))
             logger.error("Gemini streaming error: %s", e, exc_info=True)
             yield f"Error generating response: {e}"
 
         if conversation_id:
-            try:
-                await save_message(conversation_id, "user", latest_user_msg)
-                assistant_content = "".join(full_response)
-                await save_message(conversation_id, "assistant", assistant_content)
-                user_messages = [m for m in messages if m["role"] == "user"]
-                if len(user_messages) == 1:
-                    title = latest_user_msg[:80]
-                    await update_conversation_title(conversation_id, title)
-                logger.info("Saved messages to conv=%s", conversation_id)
-            except Exception as e:
-                logger.error("Failed to save messages to DB: %s", e, exc_info=True)
-
-    return StreamingResponse(event_generator(), media_type="text/plain")
+            # Persisted in bulk by the db_service write-behind queue
+            queue_message(conversation_id, "user", latest_user_msg, user_id)
+            queue_message(conversation_id, "assistant", "".join(full_response), user_id)
+            session_store.record_turn(conversation_id, user_id, latest_user_msg, "".join(full_response))
+            user_messages = [m for m in messages if m["role"] == "user"]
+            if len(user_messages) == 1:
+                queue_title(conversation_id, latest_user_msg[:80], user_id)
+            logger.info("Queued messages for conv=%s", conversation_id)
+
+    return _event_stream(start_stream(generate(), on_finish=slot.release))
+
+
+@router.get("/chat/streams/{stream_id}")
+async def resume_chat(
+    stream_id: str,
+    last_event_id: Optional[str] = Header(default=None),
+    after: Optional[int] = Query(default=None, ge=0, description="Last event id received, if not sent as a header"),
+):
+    """Reconnect to a chat stream: replays the chunks after Last-Event-ID, then follows the generation."""
+    stream = get_stream(stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Stream not found or expired")
+    resume = parse_last_event_id(last_event_id)
+    position = resume[1] if resume and resume[0] == stream_id else (after or 0)
+    return _event_stream(stream, position)
+
+
+@router.delete("/chat/streams/{stream_id}")
+async def cancel_chat(stream_id: str):
+    """Stop a generation the client no longer wants."""
+    stream = get_stream(stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Stream not found or expired")
+    stream.cancel()
+    return {"cancelled": not stream.done}
@@ -3,7 +3,8 @@ import logging
 import jwt
 from fastapi import APIRouter, Depends, HTTPException, Request
 
-from config import settings
+from services import session_store
+from services.auth_service import verify_token
 from services.db_service import (
     create_conversation,
     list_conversations,
@@ -18,24 +19,16 @@ router = APIRouter()
 
 
 async def get_current_user(request: Request) -> str:
-    """Extract user_id from the Supabase JWT in the Authorization header."""
+    """Verify the Supabase JWT in the Authorization header and return its user_id."""
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing auth token")
 
     token = auth_header.split(" ", 1)[1]
     try:
-        # Supabase JWTs are signed with the JWT secret (derived from service role key)
-        # For simplicity, decode without verification and trust the token
-        # since it came from our own Supabase instance
-        payload = jwt.decode(token, options={"verify_signature": False})
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        logger.info("Authenticated user: %s", user_id[:8])
-        return user_id
-    except jwt.DecodeError:
-        logger.warning("Invalid JWT token received")
+        return await verify_token(token)
+    except jwt.InvalidTokenError as e:
+        logger.warning("Invalid JWT token received: %s", e)
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
@@ -59,6 +52,7 @@ async def delete_user_conversation(
     user_id: str = Depends(get_current_user),
 ):
     deleted = await delete_conversation(user_id, conversation_id)
+    session_store.drop(conversation_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return {"ok": True}
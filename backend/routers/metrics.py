@@ -0,0 +1,59 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services import answer_cache, auth_service, chat_streams, context_window, db_service, entity_index, metrics
+from services import search_service, session_store, sports_service, upstream
+
+
+router = APIRouter()
+
+
+def _cache_metrics() -> dict:
+    """Counters of the in-process caches, one ``cache`` label per cache."""
+    caches = {
+        "scoreboard": sports_service.get_cache_stats(),
+        "search": search_service.get_cache_stats(),
+        "conversations": db_service.get_read_cache_stats(),
+        "answers": answer_cache.get_cache_stats(),
+    }
+    samples: dict = {}
+    for cache, stats in caches.items():
+        for stat, value in stats.items():
+            if isinstance(value, (int, float)):
+                samples.setdefault(f"sportsgpt_cache_{stat}", {})[(("cache", cache),)] = value
+    return samples
+
+
+def _component_metrics() -> dict:
+    components = {
+        "context_window": context_window.get_window_stats(),
+        "auth": auth_service.get_auth_stats(),
+        "entity_index": entity_index.get_index_stats(),
+        "chat_streams": chat_streams.get_stream_stats(),
+        "sessions": session_store.get_session_stats(),
+    }
+    return {
+        f"sportsgpt_{component}_{stat}": {(): value}
+        for component, stats in components.items()
+        for stat, value in stats.items()
+    }
+
+
+def _upstream_metrics() -> dict:
+    """Per-upstream calls, failures and hedging; breaker state and hedges are metrics of their own."""
+    samples: dict = {}
+    for name, stats in upstream.get_upstream_stats().items():
+        for stat in ("calls", "failures", "hedge_rate", "hedge_delay_seconds"):
+            samples.setdefault(f"sportsgpt_upstream_{stat}", {})[(("upstream", name),)] = stats[stat]
+    return samples
+
+
+metrics.register_collector(_cache_metrics)
+metrics.register_collector(_component_metrics)
+metrics.register_collector(_upstream_metrics)
+
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    """Pipeline latencies, upstream errors and cache counters for Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
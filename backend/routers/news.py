@@ -1,13 +1,24 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from services.news_service import get_trending_news
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+
+from services.news_service import ESPN_RSS_FEEDS, get_trending_news_bytes
 
 
 router = APIRouter()
 
 
 @router.get("/news")
-async def trending_news():
-    """Get trending sports news headlines."""
-    articles = await get_trending_news(count=4)
-    return {"articles": articles}
+async def trending_news(
+    sport: Optional[str] = Query(default=None),
+    count: int = Query(default=4, ge=1, le=50),
+):
+    """Get trending sports headlines, optionally for one sport's feed.
+
+    Served from the background aggregator's snapshot without upstream I/O.
+    """
+    if sport is not None and sport not in ESPN_RSS_FEEDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported sport: {sport}")
+    body = await get_trending_news_bytes(count, sport)
+    return Response(content=body, media_type="application/json")
@@ -1,15 +1,108 @@
-from fastapi import APIRouter, Query
+import json
+from typing import Optional
 
-from services.sports_service import get_live_scores
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from sse_starlette.sse import EventSourceResponse
+
+from config import settings
+from services.date_parser import parse_dates_param
+from services.http_cache import EncodedBody
+from services.score_poller import seed, subscribe, unsubscribe
+from services.sports_service import (
+    SPORT_ENDPOINTS,
+    get_cache_stats,
+    get_live_scores,
+    get_scores_body,
+    serialize_scores,
+)
 
 
 router = APIRouter()
 
 
+def _parse_sports(sport: str) -> list[str]:
+    sports = [s.strip().lower() for s in sport.split(",") if s.strip()]
+    unsupported = [s for s in sports if s not in SPORT_ENDPOINTS]
+    if not sports or unsupported:
+        raise HTTPException(status_code=400, detail=f"Unsupported sport: {','.join(unsupported) or sport}")
+    return sports
+
+
+def _cached_response(body: EncodedBody, request: Request) -> Response:
+    """The body in the best coding the client accepts, or 304 if its ETag still matches."""
+    encoding = body.choose_encoding(request.headers.get("accept-encoding", ""))
+    # no-cache: browsers keep the body but revalidate with If-None-Match on every poll
+    headers = {"ETag": body.etag(encoding), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if body.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body.encoded(encoding), media_type="application/json", headers=headers)
+
+
 @router.get("/scores")
-async def scores(sport: str = Query(default="nfl")):
-    """Get live scores for a given sport.
+async def scores(
+    request: Request,
+    sport: str = Query(default="nfl", description="One sport, or several comma-separated"),
+    dates: Optional[str] = Query(default=None, description="YYYYMMDD or YYYYMMDD-YYYYMMDD"),
+):
+    """Get live scores for one or more sports, optionally for a day or range of days.
+
+    Several comma-separated sports return ``{"scores": [...]}`` in the order
+    given. Responses carry a strong ETag and are compressed when large.
+
+    Supported: the keys of ``SPORT_ENDPOINTS`` (nfl, nba, mlb, nhl, soccer,
+    ncaaf, ncaab and the cricket leagues: cricket, ipl, bbl, psl, cpl,
+    the_hundred, sa20, county).
+    """
+    # A single unknown sport keeps answering with the error payload, as before
+    sports = _parse_sports(sport) if "," in sport else [sport.strip().lower()]
+    date_range = None
+    if dates:
+        try:
+            date_range = parse_dates_param(dates)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid dates: {e}")
+        # Each sport and day can be its own ESPN fetch
+        days = (date_range[1] - date_range[0]).days + 1
+        if len(sports) * days > settings.scores_max_sport_days:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many scoreboards: {len(sports)} sports x {days} days "
+                       f"(at most {settings.scores_max_sport_days}); narrow the dates or sports",
+            )
+    return _cached_response(await get_scores_body(sports, date_range), request)
+
 
-    Supported: nfl, nba, mlb, nhl, soccer, ncaaf, ncaab
+@router.get("/scores/stream")
+async def scores_stream(sport: str = Query(default="nfl")):
+    """Stream score updates for one or more comma-separated sports over SSE.
+
+    Sends a ``snapshot`` event per sport, then ``update`` events carrying only
+    the games whose score or status changed.
     """
-    return await get_live_scores(sport)
+    sports = _parse_sports(sport)
+
+    async def event_stream():
+        queue = subscribe(sports)
+        try:
+            for s in sports:
+                # Fresh, and the poller's baseline, so no change falls between the two
+                scores = await get_live_scores(s, allow_stale=False)
+                seed(s, scores.get("games", []))
+                snapshot = serialize_scores(scores)
+                yield {"event": "snapshot", "data": json.dumps(snapshot)}
+            while True:
+                update = await queue.get()
+                yield {"event": "update", "data": json.dumps(update)}
+        finally:
+            unsubscribe(queue, sports)
+
+    return EventSourceResponse(event_stream())
+
+
+@router.get("/scores/cache")
+async def scores_cache_stats():
+    """Hit/miss/refresh counters for the shared scoreboard cache."""
+    return get_cache_stats()
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from config import settings
+from services.metrics import CHAT_ACTIVE, CHAT_DEGRADED, CHAT_QUEUE_DEPTH, CHAT_QUEUE_WAIT_SECONDS, CHAT_SHED
+
+
+logger = logging.getLogger("sportsgpt.admission")
+
+# Degradation levels handed to the chat handler with each slot
+NORMAL = 0
+SKIP_SEARCH = 1   # many slots busy: drop the web search
+REDUCED = 2       # had to queue: also shorter answers and a smaller scores block
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; carries the HTTP status and Retry-After seconds."""
+
+    def __init__(self, reason: str, status_code: int, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class Slot:
+    """One admitted generation. ``release`` is idempotent."""
+
+    def __init__(self, controller: "AdmissionController", level: int):
+        self.level = level
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(time.monotonic() - self._started)
+
+
+class AdmissionController:
+    """Caps concurrent generations, with a bounded FIFO wait queue and a queue-time budget.
+
+    A request that finds the queue full, or does not get a slot within the
+    budget, is shed with 503 and a Retry-After estimated from how long
+    generations currently hold their slots. After an upstream rate limit,
+    new requests are shed with 429 until the cooldown ends.
+    """
+
+    def __init__(self, max_active: int, max_queued: int, queue_budget: float):
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.queue_budget = queue_budget
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._cooldown_until = 0.0
+        # Moving average of how long a generation holds its slot (seconds)
+        self._hold_seconds = 5.0
+
+    def _retry_after(self) -> int:
+        backlog = len(self._waiters) + 1
+        return max(1, min(30, math.ceil(self._hold_seconds * backlog / self.max_active)))
+
+    def _shed(self, reason: str, status_code: int, retry_after: int) -> Overloaded:
+        CHAT_SHED.inc(reason=reason)
+        logger.warning("Shedding chat request (%s), active=%d queued=%d", reason, self.active, len(self._waiters))
+        return Overloaded(reason, status_code, retry_after)
+
+    def _admit(self, level: int) -> Slot:
+        if level == NORMAL and self.active >= self.max_active * settings.chat_degrade_at:
+            level = SKIP_SEARCH
+        if level != NORMAL:
+            CHAT_DEGRADED.inc(level=str(level))
+        CHAT_ACTIVE.set(self.active)
+        return Slot(self, level)
+
+    async def acquire(self) -> Slot:
+        """Wait for a slot. Raises ``Overloaded`` if the request should be shed."""
+        remaining = self._cooldown_until - time.monotonic()
+        if remaining > 0:
+            raise self._shed("upstream_rate_limited", 429, math.ceil(remaining))
+
+        if self.active < self.max_active and not self._waiters:
+            self.active += 1
+            return self._admit(NORMAL)
+        if len(self._waiters) >= self.max_queued:
+            raise self._shed("queue_full", 503, self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        CHAT_QUEUE_DEPTH.set(len(self._waiters))
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.queue_budget)
+        except asyncio.TimeoutError:
+            raise self._shed("queue_timeout", 503, self._retry_after())
+        except asyncio.CancelledError:
+            # The client went away just as a slot was handed over: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self._release(0.0)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            CHAT_QUEUE_DEPTH.set(len(self._waiters))
+            CHAT_QUEUE_WAIT_SECONDS.observe(time.monotonic() - start)
+        # The releasing generation handed its slot straight to us
+        return self._admit(REDUCED)
+
+    def _release(self, held: float) -> None:
+        if held:
+            self._hold_seconds += 0.1 * (held - self._hold_seconds)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+        CHAT_ACTIVE.set(self.active)
+
+    def note_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Stop admitting new generations for a while after the upstream returned 429."""
+        cooldown = retry_after or settings.gemini_rate_limit_cooldown
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + cooldown)
+        logger.warning("Gemini rate limited, shedding new chats for %.0fs", cooldown)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "active": self.active,
+            "queued": len(self._waiters),
+            "max_active": self.max_active,
+            "avg_hold_seconds": round(self._hold_seconds, 2),
+            "cooldown_seconds": round(max(0.0, self._cooldown_until - time.monotonic()), 1),
+        }
+
+
+chat_admission = AdmissionController(settings.chat_max_concurrent, settings.chat_max_queued,
+                                     settings.chat_queue_budget)
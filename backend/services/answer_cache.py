@@ -0,0 +1,48 @@
+import asyncio
+import hashlib
+import logging
+from typing import Any, AsyncGenerator, Optional
+
+from config import settings
+from services.cache_service import TTLCache
+from services.intent_service import normalize_query
+
+
+logger = logging.getLogger("sportsgpt.answers")
+
+# Streamed answer chunks keyed by question + injected context fingerprint
+_answer_cache = TTLCache("answers", max_entries=settings.answer_cache_size)
+
+
+def answer_key(question: str, scores_context: str, search_context: str) -> str:
+    """Cache key for a first-turn answer.
+
+    Hashing the exact context injected into the prompt means a cached answer
+    stops matching as soon as the scoreboard or search results change.
+    """
+    digest = hashlib.sha256()
+    for part in (normalize_query(question), scores_context, search_context):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_answer(key: str) -> Optional[list[str]]:
+    return _answer_cache.get(key)
+
+
+def store_answer(key: str, chunks: list[str]) -> None:
+    if chunks:
+        _answer_cache.set(key, list(chunks), settings.answer_cache_ttl)
+
+
+async def replay_answer(chunks: list[str]) -> AsyncGenerator[str, None]:
+    """Stream a cached answer back at roughly generation speed."""
+    for i, chunk in enumerate(chunks):
+        if i:
+            await asyncio.sleep(settings.answer_replay_interval)
+        yield chunk
+
+
+def get_cache_stats() -> dict[str, Any]:
+    return _answer_cache.stats()
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import httpx
+import jwt
+
+from config import settings
+from services import resources
+
+
+logger = logging.getLogger("sportsgpt.auth")
+
+# Supabase access tokens are issued for this audience
+AUDIENCE = "authenticated"
+
+ALGORITHMS = ["HS256", "RS256", "ES256"]
+
+# Verified tokens: sha256(token) -> (user_id, exp)
+_verified: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+# Signing keys from the project's JWKS endpoint, keyed by kid
+_jwks: dict[str, jwt.PyJWK] = {}
+_jwks_fetched_at = 0.0
+_jwks_lock = asyncio.Lock()
+_refresh_task: Optional[asyncio.Task] = None
+
+_stats = {"cache_hits": 0, "verifications": 0, "failures": 0}
+
+
+def get_auth_stats() -> dict[str, int]:
+    return dict(_stats, cached_tokens=len(_verified), signing_keys=len(_jwks))
+
+
+def _jwks_url() -> str:
+    return f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+
+async def refresh_jwks() -> None:
+    """Fetch the project's signing keys."""
+    global _jwks, _jwks_fetched_at
+    response = await resources.get_http().get(_jwks_url())
+    response.raise_for_status()
+    keys = {}
+    for jwk in response.json().get("keys", []):
+        try:
+            keys[jwk.get("kid", "")] = jwt.PyJWK(jwk)
+        except jwt.PyJWKError as e:
+            logger.warning("Skipping unusable JWKS key %s: %s", jwk.get("kid"), e)
+    _jwks = keys
+    _jwks_fetched_at = time.monotonic()
+    logger.info("Loaded %d JWKS signing keys", len(keys))
+
+
+async def _signing_key(token: str) -> Any:
+    """Pick the key to verify a token with: the shared secret or a JWKS key."""
+    header = jwt.get_unverified_header(token)
+    if header.get("alg") not in ALGORITHMS:
+        raise jwt.InvalidTokenError(f"Unsupported algorithm: {header.get('alg')}")
+    if header.get("alg") == "HS256":
+        if not settings.supabase_jwt_secret:
+            raise jwt.InvalidTokenError("HS256 token but SUPABASE_JWT_SECRET is not set")
+        return settings.supabase_jwt_secret
+
+    kid = header.get("kid", "")
+    if kid not in _jwks:
+        # Unknown kid: the keys may have rotated. Refetch, at most once a minute.
+        async with _jwks_lock:
+            if kid not in _jwks and settings.supabase_url and time.monotonic() - _jwks_fetched_at > 60:
+                try:
+                    await refresh_jwks()
+                except httpx.HTTPError as e:
+                    logger.warning("JWKS fetch failed: %s", e)
+    if kid not in _jwks:
+        raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+    return _jwks[kid]
+
+
+async def verify_token(token: str) -> str:
+    """Verify a Supabase access token and return its user id.
+
+    Verified claims are cached per token until the token expires, so repeated
+    requests from one session skip the signature check.
+    Raises ``jwt.InvalidTokenError`` if the token is not valid.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = _verified.get(digest)
+    if cached is not None:
+        user_id, exp = cached
+        if exp > time.time():
+            _stats["cache_hits"] += 1
+            _verified.move_to_end(digest)
+            return user_id
+        del _verified[digest]
+
+    _stats["verifications"] += 1
+    try:
+        key = await _signing_key(token)
+        payload = jwt.decode(
+            token,
+            key,
+            algorithms=ALGORITHMS,
+            audience=AUDIENCE,
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.InvalidTokenError:
+        _stats["failures"] += 1
+        raise
+
+    user_id = payload["sub"]
+    _verified[digest] = (user_id, float(payload["exp"]))
+    while len(_verified) > settings.auth_cache_size:
+        _verified.popitem(last=False)
+    logger.debug("Authenticated user: %s", user_id[:8])
+    return user_id
+
+
+async def _refresh_loop() -> None:
+    while True:
+        try:
+            await refresh_jwks()
+        except Exception as e:
+            logger.warning("JWKS refresh failed: %s", e)
+        await asyncio.sleep(settings.jwks_refresh_interval)
+
+
+def start_jwks_refresh() -> None:
+    """Keep the JWKS signing keys fresh in the background."""
+    global _refresh_task
+    if _refresh_task is None and settings.supabase_url:
+        _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_jwks_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
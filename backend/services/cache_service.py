@@ -0,0 +1,349 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Union
+
+
+logger = logging.getLogger("sportsgpt.cache")
+
+_MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class TTLCache:
+    """In-process TTL cache with single-flight fetches and stale-while-revalidate.
+
+    Concurrent misses for the same key share one in-flight fetch. An expired
+    entry that is still inside its stale window is returned immediately while
+    a background task refreshes it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        stale_ttl: float = 0.0,
+        max_entries: Optional[int] = None,
+    ):
+        self.name = name
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, _Entry] = OrderedDict()
+        self._inflight: dict[Any, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.fetches = 0
+        self.errors = 0
+
+    def peek(self, key: Any) -> Any:
+        """Return the cached value for key regardless of age, or None."""
+        entry = self._entries.get(key)
+        return entry.value if entry else None
+
+    def get(self, key: Any) -> Any:
+        """Return the fresh cached value for key, or None, counting the lookup."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+        self.misses += 1
+        return None
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + ttl, now + ttl + self.stale_ttl)
+        self._entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        key: Any,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Union[float, Callable[[Any], float]],
+        allow_stale: bool = True,
+    ) -> Any:
+        """Return the cached value for key, fetching it on a miss.
+
+        ``ttl`` is either a number of seconds or a callable computing the TTL
+        from the fetched value.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            if now < entry.expires_at:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if allow_stale and now < entry.stale_until:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch, ttl)
+                return entry.value
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_fetch(key, fetch, ttl)
+        return await asyncio.shield(task)
+
+    async def refresh(
+        self,
+        key: Any,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Union[float, Callable[[Any], float]],
+    ) -> Any:
+        """Fetch key now, joining an in-flight fetch if there is one."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.refreshes += 1
+            task = self._start_fetch(key, fetch, ttl)
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, key, fetch, ttl) -> asyncio.Task:
+        self.fetches += 1
+
+        async def run():
+            try:
+                value = await fetch()
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self._inflight.pop(key, None)
+            self.set(key, value, ttl(value) if callable(ttl) else ttl)
+            return value
+
+        task = asyncio.create_task(run())
+        self._inflight[key] = task
+        return task
+
+    def _refresh_in_background(self, key, fetch, ttl) -> None:
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        task = self._start_fetch(key, fetch, ttl)
+        task.add_done_callback(self._log_refresh_failure)
+
+    def _log_refresh_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed in %s cache: %s", self.name, task.exception())
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "fetches": self.fetches,
+            "errors": self.errors,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """Bounded LRU cache with versioned invalidation.
+
+    Readers take ``version(key)`` before loading and pass it to ``set`` so a
+    load that raced with an invalidation is not cached. With ``shared=True``
+    invalidations are also broadcast to other workers over the invalidation bus.
+    ``on_invalidate`` is called with every key invalidated here or by another
+    worker, for entries derived from it that are keyed differently.
+    """
+
+    def __init__(self, name: str, max_entries: int, shared: bool = False,
+                 on_invalidate: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.shared = shared
+        self.on_invalidate = on_invalidate
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        self._versions: OrderedDict[Any, int] = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        if shared:
+            _shared_caches[name] = self
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING and self.shared and _bus is not None and not _bus.connected:
+            # Other workers' invalidations are not arriving, so the entry may be stale
+            value = _MISSING
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def version(self, key: Any) -> int:
+        # Both counters only grow, so any invalidation changes the sum
+        return self._generation + self._versions.get(key, 0)
+
+    def set(self, key: Any, value: Any, version: Optional[int] = None) -> None:
+        if version is not None and version != self.version(key):
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Any) -> None:
+        for key in keys:
+            self._invalidate_local(key)
+        if self.shared and _bus is not None:
+            _bus.publish(self.name, keys)
+
+    def _invalidate_local(self, key: Any) -> None:
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        self._versions[key] = self._versions.pop(key, 0) + 1
+        while len(self._versions) > self.max_entries * 4:
+            self._versions.popitem(last=False)
+        if self.on_invalidate is not None:
+            self.on_invalidate(key)
+
+    def _clear_local(self) -> None:
+        """Drop every entry and make loads already in flight uncacheable."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# --- Cross-worker invalidation over Redis pub/sub (optional) ---
+
+INVALIDATION_CHANNEL = "sportsgpt:cache-invalidate"
+# Listener reconnect backoff (seconds)
+BUS_RETRY_MIN_DELAY = 1.0
+BUS_RETRY_MAX_DELAY = 30.0
+
+_shared_caches: dict[str, LRUCache] = {}
+
+
+class _InvalidationBus:
+    def __init__(self, redis_client):
+        self._redis = redis_client
+        self._worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._listener: Optional[asyncio.Task] = None
+        # False until subscribed and while reconnecting
+        self.connected = False
+        self._retry_delay = BUS_RETRY_MIN_DELAY
+
+    def publish(self, cache_name: str, keys: tuple) -> None:
+        message = json.dumps({"worker": self._worker_id, "cache": cache_name, "keys": keys})
+        task = asyncio.get_running_loop().create_task(self._redis.publish(INVALIDATION_CHANNEL, message))
+        task.add_done_callback(_log_publish_failure)
+
+    async def listen(self) -> None:
+        """Receive invalidations, resubscribing with backoff whenever the connection drops."""
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Cache invalidation listener disconnected, retrying in %.0fs: %s",
+                             self._retry_delay, e)
+            await asyncio.sleep(self._retry_delay)
+            self._retry_delay = min(self._retry_delay * 2, BUS_RETRY_MAX_DELAY)
+
+    async def _listen(self) -> None:
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Anything published before now (or while disconnected) was missed
+            for cache in _shared_caches.values():
+                cache._clear_local()
+            self.connected = True
+            self._retry_delay = BUS_RETRY_MIN_DELAY
+            await self._receive(pubsub)
+        finally:
+            self.connected = False
+            await pubsub.aclose()
+
+    async def _receive(self, pubsub) -> None:
+        async for message in pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            payload = json.loads(message["data"])
+            if payload["worker"] == self._worker_id:
+                continue
+            cache = _shared_caches.get(payload["cache"])
+            if cache is not None:
+                for key in payload["keys"]:
+                    cache._invalidate_local(tuple(key) if isinstance(key, list) else key)
+
+
+_bus: Optional[_InvalidationBus] = None
+
+
+def _log_publish_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Failed to publish cache invalidation: %s", task.exception())
+
+
+async def start_invalidation_bus(redis_url: str) -> None:
+    """Share LRU cache invalidations between workers through Redis, if configured."""
+    global _bus
+    if not redis_url or _bus is not None:
+        return
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        logger.warning("redis not installed, cache invalidations stay per-worker")
+        return
+    _bus = _InvalidationBus(redis.from_url(redis_url, decode_responses=True))
+    _bus._listener = asyncio.create_task(_bus.listen())
+    logger.info("Cache invalidation bus started")
+
+
+def invalidation_bus_running() -> bool:
+    """Whether other workers' invalidations are currently being received."""
+    return _bus is not None and _bus.connected
+
+
+async def stop_invalidation_bus() -> None:
+    global _bus
+    if _bus is None:
+        return
+    _bus._listener.cancel()
+    try:
+        await _bus._listener
+    except asyncio.CancelledError:
+        pass
+    await _bus._redis.aclose()
+    _bus = None
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Optional
+
+from config import settings
+
+
+logger = logging.getLogger("sportsgpt.streams")
+
+# Each chat generation runs in its own task and records its chunks here, so
+# a client that drops mid-answer can reconnect with Last-Event-ID and pick up
+# where it left off instead of starting a second Gemini generation. Finished
+# streams are kept for chat_stream_retention seconds, at most
+# chat_stream_buffer_size of them.
+
+
+class StreamFailed(Exception):
+    """Raised by a generation to end its stream with an error event instead of text."""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.error = {"status": status, "message": message, "retry_after": retry_after}
+
+
+class ChatStream:
+    """One generation's chunks, followed by any number of clients.
+
+    Event ids are positions in ``chunks``: event ``n`` carries ``chunks[n - 1]``.
+    """
+
+    def __init__(self, stream_id: str):
+        self.id = stream_id
+        self.chunks: list[str] = []
+        self.done = False
+        self.cancelled = False
+        self.error: Optional[dict[str, Any]] = None
+        self.finished_at = 0.0
+        self.subscribers = 0
+        self._followed = False
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._idle_timer: Optional[asyncio.TimerHandle] = None
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _append(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def _finish(self, cancelled: bool = False, error: Optional[dict[str, Any]] = None) -> None:
+        self.done = True
+        self.cancelled = cancelled
+        self.error = error
+        self.finished_at = time.monotonic()
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        self._notify()
+
+    async def follow(self, after: int = 0) -> AsyncIterator[tuple[int, str]]:
+        """Yield ``(event_id, chunk)`` for every chunk after ``after``, then live ones until done."""
+        position = max(0, after)
+        if self._followed:
+            _stats["resumed"] += 1
+        self._followed = True
+        self.subscribers += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        try:
+            while True:
+                changed = self._changed
+                while position < len(self.chunks):
+                    position += 1
+                    yield position, self.chunks[position - 1]
+                if self.done:
+                    return
+                await changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                # Give the client a chance to reconnect before dropping the generation
+                self._idle_timer = asyncio.get_running_loop().call_later(
+                    settings.chat_stream_grace_period, self._abandon)
+
+    def _abandon(self) -> None:
+        self._idle_timer = None
+        if self.subscribers == 0 and not self.done:
+            logger.info("No client reconnected to stream %s, cancelling generation", self.id)
+            self.cancel()
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+_streams: OrderedDict[str, ChatStream] = OrderedDict()
+_stats = {"started": 0, "resumed": 0, "abandoned": 0, "evicted": 0}
+
+
+async def _produce(stream: ChatStream, source: AsyncIterator[str]) -> None:
+    try:
+        async with aclosing(source) as chunks:
+            async for chunk in chunks:
+                stream._append(chunk)
+    except asyncio.CancelledError:
+        _stats["abandoned"] += 1
+        stream._finish(cancelled=True)
+        return
+    except StreamFailed as e:
+        stream._finish(error=e.error)
+        return
+    except Exception as e:
+        logger.error("Chat stream %s failed: %s", stream.id, e, exc_info=True)
+    stream._finish()
+
+
+def _prune() -> None:
+    """Drop expired finished streams, then the oldest finished ones beyond the size limit."""
+    now = time.monotonic()
+    for stream_id, stream in list(_streams.items()):
+        if stream.done and now - stream.finished_at > settings.chat_stream_retention:
+            del _streams[stream_id]
+    excess = len(_streams) - settings.chat_stream_buffer_size
+    if excess > 0:
+        for stream_id in [sid for sid, s in _streams.items() if s.done][:excess]:
+            del _streams[stream_id]
+            _stats["evicted"] += 1
+
+
+def start_stream(source: AsyncIterator[str], on_finish: Optional[Callable[[], None]] = None) -> ChatStream:
+    """Run ``source`` to completion in the background and buffer its chunks under a new stream id.
+
+    ``on_finish`` is called once the generation ends, however it ends.
+    """
+    _prune()
+    stream = ChatStream(secrets.token_urlsafe(12))
+    _streams[stream.id] = stream
+    stream._task = asyncio.create_task(_produce(stream, source))
+    if on_finish is not None:
+        stream._task.add_done_callback(lambda _: on_finish())
+    _stats["started"] += 1
+    return stream
+
+
+def get_stream(stream_id: str) -> Optional[ChatStream]:
+    return _streams.get(stream_id)
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[tuple[str, int]]:
+    """Split a ``<stream_id>:<event_id>`` Last-Event-ID into its parts."""
+    if not value:
+        return None
+    stream_id, _, position = value.rpartition(":")
+    if not stream_id or not position.isdigit():
+        return None
+    return stream_id, int(position)
+
+
+def get_stream_stats() -> dict[str, int]:
+    return dict(_stats, buffered=len(_streams), running=sum(not s.done for s in _streams.values()))
+
+
+async def stop_streams() -> None:
+    """Cancel generations still running at shutdown."""
+    tasks = [s._task for s in _streams.values() if s._task is not None and not s._task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,74 +1,174 @@
+import asyncio
 import logging
+import time
 from datetime import date
-from typing import AsyncGenerator
-
-from google import genai
+from typing import AsyncGenerator, Optional
 
 from config import settings
-from prompts.system_prompt import SPORTS_SYSTEM_PROMPT
+from prompts.assembly import STATIC_PREFIX, build_contents, render_context
+from services import resources
+from services.context_window import estimate_tokens, fit_history
+from services.metrics import (
+    GEMINI_GENERATION_SECONDS,
+    GEMINI_OUTPUT_CHARS_PER_SECOND,
+    GEMINI_TTFT_SECONDS,
+    INFLIGHT_STREAMS,
+    UPSTREAM_ERRORS,
+)
+from services.upstream import Upstream
 
 
 logger = logging.getLogger("sportsgpt.gemini")
 
+# Generations are neither cheap nor idempotent: breaker only, no hedging
+_gemini = Upstream("gemini")
+
+MODEL = "gemini-2.5-flash"
+_STATIC_TOKENS = estimate_tokens(STATIC_PREFIX)
 
-_client = None
+# Explicit provider cache of STATIC_PREFIX (settings.gemini_prefix_cache)
+_prefix_cache_name: Optional[str] = None
+_prefix_cache_until = 0.0
+_prefix_cache_lock = asyncio.Lock()
 
 
 def _get_client():
-    global _client
-    if _client is None:
-        logger.info("Initializing Gemini client")
-        _client = genai.Client(api_key=settings.gemini_api_key)
-    return _client
+    return resources.get_gemini()
+
+
+async def summarize(prompt: str, max_output_tokens: int) -> str:
+    """Generate a short, non-streamed completion (used for conversation summaries)."""
+    response = await _gemini.call(lambda: _get_client().aio.models.generate_content(
+        model=MODEL,
+        contents=prompt,
+        config={"max_output_tokens": max_output_tokens},
+    ))
+    return (response.text or "").strip()
+
+
+async def _cached_prefix() -> Optional[str]:
+    """Name of the provider cache holding the static prefix, created on first use.
+
+    Returns None when explicit caching is off or the provider refused it
+    (e.g. the prefix is under the model's minimum cacheable size); requests
+    then send the prefix inline and rely on implicit prefix caching.
+    """
+    global _prefix_cache_name, _prefix_cache_until
+    if not settings.gemini_prefix_cache:
+        return None
+    if time.monotonic() < _prefix_cache_until:
+        return _prefix_cache_name
+    async with _prefix_cache_lock:
+        if time.monotonic() < _prefix_cache_until:
+            return _prefix_cache_name
+        ttl = settings.gemini_prefix_cache_ttl
+        try:
+            cache = await _get_client().aio.caches.create(
+                model=MODEL,
+                config={"system_instruction": STATIC_PREFIX, "ttl": f"{ttl}s",
+                        "display_name": "sportsgpt-static-prefix"},
+            )
+            _prefix_cache_name = cache.name
+            logger.info("Created Gemini prefix cache %s (~%d tokens)", cache.name, _STATIC_TOKENS)
+        except Exception as e:
+            # Don't retry on every request; try again after one TTL
+            _prefix_cache_name = None
+            logger.warning("Could not create Gemini prefix cache, sending the prefix inline: %s", e)
+        # Renew a minute before the provider expires it
+        _prefix_cache_until = time.monotonic() + max(ttl - 60, ttl / 2)
+    return _prefix_cache_name
+
+
+def _forget_cached_prefix() -> None:
+    global _prefix_cache_until
+    _prefix_cache_until = 0.0
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether an SDK error is Gemini's 429 RESOURCE_EXHAUSTED."""
+    return getattr(error, "code", None) == 429
+
+
+def unavailable_for() -> float:
+    """Seconds until Gemini's open circuit breaker lets a call through again (0 when closed)."""
+    return _gemini.open_for()
 
 
 async def stream_chat_response(
     messages: list[dict],
     scores_context: str = "",
     search_context: str = "",
+    conversation_id: Optional[str] = None,
+    sport: str = "none",
+    max_output_tokens: int = 1024,
+    user_id: Optional[str] = None,
 ) -> AsyncGenerator[str, None]:
-    """Stream a response from Gemini, constrained to sports topics."""
-    today = date.today().strftime("%B %d, %Y")
-    system_prompt = f"Today's date is {today}.\n\n{SPORTS_SYSTEM_PROMPT}"
-
-    if scores_context:
-        system_prompt += (
-            "\n\n--- LIVE SCORES DATA ---\n"
-            "The following are real-time scores fetched just now. "
-            "Use this data to answer the user's question about current games and scores. "
-            "Present the data in a clear, well-formatted way.\n"
-            f"{scores_context}\n"
-            "--- END LIVE SCORES DATA ---"
+    """Stream a response from Gemini, constrained to sports topics.
+
+    ``sport`` only labels the latency metrics. Earlier turns are summarized
+    only for a conversation whose owner ``user_id`` has been verified.
+    """
+    context = render_context(date.today(), scores_context, search_context)
+    summary_key = (user_id, conversation_id) if user_id and conversation_id else None
+    summary, messages = fit_history(messages, _STATIC_TOKENS + estimate_tokens(context), summary_key)
+    if summary:
+        context = render_context(date.today(), scores_context, search_context, summary)
+    contents = build_contents(messages, context)
+
+    cached_prefix = await _cached_prefix()
+    config = {"max_output_tokens": max_output_tokens}
+    if cached_prefix:
+        config["cached_content"] = cached_prefix
+    else:
+        config["system_instruction"] = STATIC_PREFIX
+
+    logger.info("Calling %s with %d messages, scores=%d chars, search=%d chars, cached prefix=%s",
+                MODEL, len(messages), len(scores_context), len(search_context), bool(cached_prefix))
+
+    _gemini.before_call()
+    INFLIGHT_STREAMS.inc()
+    start = time.perf_counter()
+    first_chunk_at = None
+    chars = 0
+    completed = False
+    stream = None
+    try:
+        # Use the SDK's async API so waiting on the next chunk never blocks the event loop
+        stream = await _get_client().aio.models.generate_content_stream(
+            model=MODEL,
+            contents=contents,
+            config=config,
         )
-
-    if search_context:
-        system_prompt += (
-            "\n\n--- WEB SEARCH RESULTS ---\n"
-            "The following are recent web search results relevant to the user's question. "
-            "Use this information to provide accurate, up-to-date answers. "
-            "Cite specific facts from these results.\n"
-            f"{search_context}\n"
-            "--- END WEB SEARCH RESULTS ---"
-        )
-
-    # Convert messages to Gemini format
-    gemini_contents = []
-    for msg in messages:
-        role = "user" if msg["role"] == "user" else "model"
-        gemini_contents.append({"role": role, "parts": [{"text": msg["content"]}]})
-
-    logger.info("Calling Gemini 2.0 Flash with %d messages, scores=%d chars, search=%d chars",
-                len(messages), len(scores_context), len(search_context))
-
-    response = _get_client().models.generate_content_stream(
-        model="gemini-2.5-flash",
-        contents=gemini_contents,
-        config={
-            "system_instruction": system_prompt,
-            "max_output_tokens": 1024,
-        },
-    )
-
-    for chunk in response:
-        if chunk.text:
-            yield chunk.text
+        async for chunk in stream:
+            if chunk.text:
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                    GEMINI_TTFT_SECONDS.observe(first_chunk_at - start, sport=sport)
+                    _gemini.record_success()
+                chars += len(chunk.text)
+                yield chunk.text
+        completed = True
+    except Exception as e:
+        UPSTREAM_ERRORS.inc(upstream="gemini")
+        # A 429 means Gemini is up but busy; admission control backs off for that
+        if not is_rate_limited(e):
+            _gemini.record_failure()
+            if cached_prefix and first_chunk_at is None:
+                # The provider may have dropped the cache early; make a new one next time
+                _forget_cached_prefix()
+        raise
+    finally:
+        INFLIGHT_STREAMS.dec()
+        if completed and first_chunk_at is None:
+            _gemini.record_success()
+        _gemini.release_probe()
+        if completed:
+            elapsed = time.perf_counter() - start
+            GEMINI_GENERATION_SECONDS.observe(elapsed, sport=sport)
+            if first_chunk_at is not None and elapsed > first_chunk_at - start:
+                GEMINI_OUTPUT_CHARS_PER_SECOND.observe(chars / (elapsed - (first_chunk_at - start)), sport=sport)
+        else:
+            # Client went away (or we failed) mid-stream: stop the upstream generation
+            logger.info("Cancelling Gemini generation before completion")
+        if stream is not None:
+            await stream.aclose()
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Any, Optional
+
+from config import settings
+from services.search_service import web_search
+from services.sports_service import get_live_scores
+
+
+logger = logging.getLogger("sportsgpt.context")
+
+
+async def gather_context(
+    sports: list[str],
+    search_query: str = "",
+    dates: Optional[tuple[date, date]] = None,
+) -> tuple[list[dict[str, Any]], str]:
+    """Fetch scoreboards and web search results concurrently within a latency budget.
+
+    Sources that are not back by the deadline are dropped so the LLM call can
+    start with partial context. Returns the scoreboards that arrived and the
+    search context (empty if skipped or late).
+    """
+    tasks: dict[asyncio.Task, str] = {}
+    for sport in sports:
+        tasks[asyncio.create_task(get_live_scores(sport, dates=dates))] = sport
+    if search_query:
+        tasks[asyncio.create_task(web_search(search_query))] = "search"
+    if not tasks:
+        return [], ""
+
+    start = time.monotonic()
+    done, pending = await asyncio.wait(tasks, timeout=settings.context_budget_seconds)
+    for task in pending:
+        # Scoreboard fetches are shielded inside the cache, so a late fetch still
+        # completes in the background and warms the cache for the next request
+        task.cancel()
+    if pending:
+        logger.warning("Context sources missed the %.2fs deadline: %s",
+                       settings.context_budget_seconds, sorted(tasks[t] for t in pending))
+
+    scores_results: list[dict[str, Any]] = []
+    search_context = ""
+    for task in done:
+        source = tasks[task]
+        if task.exception() is not None:
+            logger.warning("Failed to fetch %s context: %s", source, task.exception())
+            continue
+        result = task.result()
+        if source == "search":
+            search_context = result
+        elif "error" not in result:
+            scores_results.append(result)
+            logger.info("Fetched %d games for %s", len(result.get("games", [])), source)
+
+    # Keep the detected sport order stable for the prompt
+    scores_results.sort(key=lambda r: sports.index(r["sport"]))
+    logger.info("Gathered context from %d/%d sources in %.0fms",
+                len(done), len(tasks), (time.monotonic() - start) * 1000)
+    return scores_results, search_context
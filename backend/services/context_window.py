@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+
+
+logger = logging.getLogger("sportsgpt.window")
+
+# Rough average for English text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PROMPT = (
+    "Summarize this earlier part of a sports chat in a few sentences. Keep the teams, "
+    "players, games and facts that later questions may refer to.\n\n"
+)
+
+# (user_id, conversation_id) -> (number of leading messages covered, summary text)
+_summaries: OrderedDict[tuple[str, str], tuple[int, str]] = OrderedDict()
+_pending: dict[tuple[str, str], asyncio.Task] = {}
+
+_stats = {
+    "requests": 0,
+    "trimmed_requests": 0,
+    "tokens_dropped": 0,
+    "tokens_summarized": 0,
+    "summaries_generated": 0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def get_window_stats() -> dict[str, int]:
+    return dict(_stats, cached_summaries=len(_summaries))
+
+
+def fit_history(
+    messages: list[dict],
+    fixed_tokens: int,
+    summary_key: Optional[tuple[str, str]] = None,
+) -> tuple[str, list[dict]]:
+    """Keep the most recent turns that fit the prompt token budget.
+
+    ``fixed_tokens`` covers the system prompt and context blocks. Older turns
+    are replaced by the cached rolling summary for ``summary_key`` (the owner
+    and conversation id), if one exists; a missing summary, or one that
+    ``summary_refresh_messages`` more messages have outgrown, is generated in
+    the background for the next request. Returns ``(summary, recent_messages)``.
+    """
+    _stats["requests"] += 1
+    budget = settings.prompt_token_budget - fixed_tokens
+    if sum(estimate_tokens(m["content"]) for m in messages) <= budget:
+        return "", messages
+
+    # Trimming is needed: leave room for the summary, then walk back from the
+    # newest message. The latest turn is always kept.
+    budget -= settings.summary_max_tokens
+    used = 0
+    cut = len(messages)
+    while cut > 0:
+        cost = estimate_tokens(messages[cut - 1]["content"])
+        if cut < len(messages) and used + cost > budget:
+            break
+        used += cost
+        cut -= 1
+
+    _stats["trimmed_requests"] += 1
+    older = messages[:cut]
+    summary = ""
+    covered = 0
+    if summary_key:
+        covered, summary = _summaries.get(summary_key, (0, ""))
+        if covered > cut:
+            # History shrank (edited or different client state); don't trust it
+            covered, summary = 0, ""
+        if covered == 0 or cut - covered >= settings.summary_refresh_messages:
+            _schedule_summary(summary_key, older)
+
+    summarized = sum(estimate_tokens(m["content"]) for m in older[:covered])
+    dropped = sum(estimate_tokens(m["content"]) for m in older[covered:])
+    _stats["tokens_summarized"] += summarized
+    _stats["tokens_dropped"] += dropped
+    logger.info("Context window: kept %d/%d messages, summarized %d tokens, dropped %d tokens",
+                len(messages) - cut, len(messages), summarized, dropped)
+    return summary, messages[cut:]
+
+
+def _schedule_summary(key: tuple[str, str], older: list[dict]) -> None:
+    if key in _pending:
+        return
+    task = asyncio.create_task(_update_summary(key, older))
+    _pending[key] = task
+    task.add_done_callback(lambda _: _pending.pop(key, None))
+
+
+async def _update_summary(key: tuple[str, str], older: list[dict]) -> None:
+    # Deferred import: claude_service imports this module
+    from services.claude_service import summarize
+
+    conversation_id = key[1]
+    covered, previous = _summaries.get(key, (0, ""))
+    if covered > len(older):
+        covered, previous = 0, ""
+
+    parts = []
+    if previous:
+        parts.append(f"Summary so far: {previous}")
+    for msg in older[covered:]:
+        parts.append(f"{msg['role']}: {msg['content']}")
+
+    try:
+        summary = await summarize(SUMMARY_PROMPT + "\n".join(parts), settings.summary_max_tokens)
+    except Exception as e:
+        logger.warning("Failed to summarize conv=%s: %s", conversation_id, e)
+        return
+
+    _summaries[key] = (len(older), summary)
+    _summaries.move_to_end(key)
+    while len(_summaries) > settings.summary_cache_size:
+        _summaries.popitem(last=False)
+    _stats["summaries_generated"] += 1
+    logger.info("Updated summary for conv=%s covering %d messages", conversation_id, len(older))
@@ -0,0 +1,128 @@
+import re
+from datetime import date, timedelta
+from typing import Optional
+
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["january", "february", "march", "april", "may", "june", "july", "august",
+          "september", "october", "november", "december"]
+
+# Longest range we will fetch day by day
+MAX_RANGE_DAYS = 14
+
+# Full names or abbreviations only: "marquee" or "decent" are not months
+_MONTH = (r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)")
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_MONTH_DAY = re.compile(rf"\b{_MONTH}\.? (\d{{1,2}})(?:st|nd|rd|th)?\b")
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})((?:st|nd|rd|th)? (?:of )?){_MONTH}\b")
+# "may" is usually the verb ("I may 3-peat"); as a month it follows one of these
+_DATE_PREPOSITION = re.compile(r"\b(?:on|in|since|from|until|till|by|before|after|between)\s+$")
+_DATES_PARAM = re.compile(r"(\d{8})(?:-(\d{8}))?")
+_LAST_N_DAYS = re.compile(r"\b(?:last|past) (\d{1,2}) days\b")
+_WEEKDAY = re.compile(r"\b(last )?(" + "|".join(WEEKDAYS) + r")(?:'s)?\b")
+
+
+def _month_index(name: str) -> int:
+    return next(i for i, month in enumerate(MONTHS, 1) if month.startswith(name[:3]))
+
+
+def _is_month(text: str, m: re.Match, month: str, day_form: Optional[str] = None) -> bool:
+    """Whether a month match is a date; "may" needs a date preposition before it,
+    or to lead the message ("May 3") or be written "3rd may" / "3 of may"."""
+    if month != "may":
+        return True
+    before = text[:m.start()]
+    if _DATE_PREPOSITION.search(before):
+        return True
+    return bool(day_form.strip()) if day_form is not None else not before.strip()
+
+
+def _past_date(month: int, day: int, today: date) -> Optional[date]:
+    """The most recent occurrence of month/day, allowing a week into the future."""
+    try:
+        candidate = date(today.year, month, day)
+    except ValueError:
+        return None
+    if candidate > today + timedelta(days=7):
+        candidate = candidate.replace(year=today.year - 1)
+    return candidate
+
+
+def parse_date_range(text: str, today: Optional[date] = None) -> Optional[tuple[date, date]]:
+    """Find the day or days a question is about.
+
+    Returns an inclusive ``(start, end)`` range, or None when the question is
+    about today (or names no date), which the live scoreboard already covers.
+    """
+    today = today or date.today()
+    text = text.lower()
+    monday = today - timedelta(days=today.weekday())
+
+    if "yesterday" in text or "last night" in text:
+        day = today - timedelta(days=1)
+        return day, day
+    if "tomorrow" in text:
+        day = today + timedelta(days=1)
+        return day, day
+    if "last weekend" in text:
+        saturday = monday - timedelta(days=2)
+        return saturday, saturday + timedelta(days=1)
+    if "this weekend" in text:
+        saturday = monday + timedelta(days=5)
+        return saturday, saturday + timedelta(days=1)
+    if "last week" in text:
+        return monday - timedelta(days=7), monday - timedelta(days=1)
+    if "this week" in text:
+        return monday, monday + timedelta(days=6)
+
+    m = _LAST_N_DAYS.search(text)
+    if m:
+        # "last 3 days" is today and the two days before it
+        days = min(max(int(m.group(1)), 1), MAX_RANGE_DAYS)
+        return today - timedelta(days=days - 1), today
+
+    m = _ISO_DATE.search(text)
+    if m:
+        try:
+            day = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            day = None
+        if day and day != today:
+            return day, day
+
+    m = next((m for m in _MONTH_DAY.finditer(text) if _is_month(text, m, m.group(1))), None)
+    if m:
+        day = _past_date(_month_index(m.group(1)), int(m.group(2)), today)
+        if day and day != today:
+            return day, day
+    m = next((m for m in _DAY_MONTH.finditer(text) if _is_month(text, m, m.group(3), m.group(2))), None)
+    if m:
+        day = _past_date(_month_index(m.group(3)), int(m.group(1)), today)
+        if day and day != today:
+            return day, day
+
+    m = _WEEKDAY.search(text)
+    if m:
+        # "saturday" means the most recent one; "last saturday" at least a day back
+        back = (today.weekday() - WEEKDAYS.index(m.group(2))) % 7
+        if m.group(1) and back == 0:
+            back = 7
+        if back:
+            day = today - timedelta(days=back)
+            return day, day
+
+    return None
+
+
+def parse_dates_param(value: str) -> tuple[date, date]:
+    """Parse a ``YYYYMMDD`` or ``YYYYMMDD-YYYYMMDD`` query parameter."""
+    m = _DATES_PARAM.fullmatch(value.strip())
+    if not m:
+        raise ValueError("Expected YYYYMMDD or YYYYMMDD-YYYYMMDD")
+    start_str, end_str = m.groups()
+    start = date(int(start_str[:4]), int(start_str[4:6]), int(start_str[6:8]))
+    end = date(int(end_str[:4]), int(end_str[4:6]), int(end_str[6:8])) if end_str else start
+    if end < start or (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"Date range must be ascending and at most {MAX_RANGE_DAYS} days")
+    return start, end
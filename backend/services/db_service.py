@@ -1,32 +1,122 @@
-from supabase import create_client, Client
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
 
 from config import settings
+from services import resources
+from services.cache_service import LRUCache
+from services.metrics import DB_WRITE_SECONDS, UPSTREAM_ERRORS
 
+if TYPE_CHECKING:
+    from supabase import AsyncClient
 
-def get_supabase_client() -> Client:
-    """Get a Supabase client using the service role key (bypasses RLS)."""
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
 
+logger = logging.getLogger("sportsgpt.db")
 
-def get_supabase_client_for_user(access_token: str) -> Client:
+
+async def get_supabase_client() -> "AsyncClient":
+    """Get the shared Supabase client using the service role key (bypasses RLS).
+
+    Owned by the resource registry, which builds it during startup warm-up.
+    """
+    return await resources.get_supabase()
+
+
+async def get_supabase_client_for_user(access_token: str) -> "AsyncClient":
     """Get a Supabase client authenticated as a specific user (respects RLS)."""
-    client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    from supabase import acreate_client
+
+    client = await acreate_client(settings.supabase_url, settings.supabase_service_role_key)
     client.postgrest.auth(access_token)
     return client
 
 
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# --- Read-through cache for conversation lists and message history ---
+#
+# Keys are ("conversations", user_id) and ("messages", conversation_id); the
+# latter holds (user_id, messages) and the owner is checked on read. Every
+# write below invalidates exactly the entries it affects, so a read after a
+# write always goes to the database.
+
+# conversation_id -> owning user_id, learned from reads and creates. Writes
+# pass the owner when they know it; this is only the fallback for those that
+# do not, and for invalidations that arrive from other workers.
+_owners: OrderedDict[str, str] = OrderedDict()
+
+
+def _remember_owner(conversation_id: str, user_id: str) -> None:
+    _owners[conversation_id] = user_id
+    _owners.move_to_end(conversation_id)
+    while len(_owners) > settings.conversation_cache_size * 8:
+        _owners.popitem(last=False)
+
+
+def _drop_owner_list(key: tuple) -> None:
+    # A conversation changed, here or on another worker: its owner's list
+    # (order, titles) changed too, if this worker knows who that is
+    if key[0] == "messages":
+        owner = _owners.get(key[1])
+        if owner is not None:
+            _read_cache._invalidate_local(("conversations", owner))
+
+
+_read_cache = LRUCache("conversations", settings.conversation_cache_size, shared=True,
+                       on_invalidate=_drop_owner_list)
+
+
+def _invalidate_conversation(conversation_id: str, user_id: Optional[str] = None) -> None:
+    user_id = user_id or _owners.get(conversation_id)
+    keys = [("messages", conversation_id)]
+    if user_id is not None:
+        keys.append(("conversations", user_id))
+    _read_cache.invalidate(*keys)
+
+
+def get_read_cache_stats() -> dict:
+    return _read_cache.stats()
+
+
+@contextmanager
+def _timed_write(operation: str):
+    """Record a write's latency, and count it as a Supabase error if it fails."""
+    with DB_WRITE_SECONDS.time(operation=operation):
+        try:
+            yield
+        except Exception:
+            UPSTREAM_ERRORS.inc(upstream="supabase")
+            raise
+
+
 async def create_conversation(user_id: str, title: str = "New Chat") -> dict:
-    client = get_supabase_client()
-    result = client.table("conversations").insert({
-        "user_id": user_id,
-        "title": title,
-    }).execute()
-    return result.data[0] if result.data else {}
+    client = await get_supabase_client()
+    with _timed_write("create_conversation"):
+        result = await client.table("conversations").insert({
+            "user_id": user_id,
+            "title": title,
+        }).execute()
+    _read_cache.invalidate(("conversations", user_id))
+    conversation = result.data[0] if result.data else {}
+    if conversation:
+        _remember_owner(conversation["id"], user_id)
+    return conversation
 
 
 async def list_conversations(user_id: str) -> list[dict]:
-    client = get_supabase_client()
-    result = (
+    key = ("conversations", user_id)
+    cached = _read_cache.get(key)
+    if cached is not None:
+        return cached
+    version = _read_cache.version(key)
+
+    client = await get_supabase_client()
+    result = await (
         client.table("conversations")
         .select("id, title, created_at, updated_at")
         .eq("user_id", user_id)
@@ -34,25 +124,46 @@ async def list_conversations(user_id: str) -> list[dict]:
         .limit(50)
         .execute()
     )
-    return result.data or []
+    conversations = result.data or []
+    for conversation in conversations:
+        _remember_owner(conversation["id"], user_id)
+    _read_cache.set(key, conversations, version)
+    return conversations
 
 
 async def delete_conversation(user_id: str, conversation_id: str) -> bool:
-    client = get_supabase_client()
-    result = (
-        client.table("conversations")
-        .delete()
-        .eq("id", conversation_id)
-        .eq("user_id", user_id)
-        .execute()
-    )
+    client = await get_supabase_client()
+    with _timed_write("delete_conversation"):
+        result = await (
+            client.table("conversations")
+            .delete()
+            .eq("id", conversation_id)
+            .eq("user_id", user_id)
+            .execute()
+        )
+    _invalidate_conversation(conversation_id, user_id)
     return len(result.data) > 0
 
 
 async def get_messages(user_id: str, conversation_id: str) -> list[dict]:
-    client = get_supabase_client()
+    return await get_history(user_id, conversation_id) or []
+
+
+async def get_history(user_id: str, conversation_id: str, use_cache: bool = True) -> Optional[list[dict]]:
+    """Messages of a conversation, or None if it does not exist or belongs to someone else.
+
+    ``use_cache=False`` always reads the database (the result is still cached).
+    """
+    key = ("messages", conversation_id)
+    cached = _read_cache.get(key) if use_cache else None
+    if cached is not None:
+        owner, messages = cached
+        return messages if owner == user_id else None
+    version = _read_cache.version(key)
+
+    client = await get_supabase_client()
     # Verify the conversation belongs to this user
-    conv = (
+    conv = await (
         client.table("conversations")
         .select("id")
         .eq("id", conversation_id)
@@ -60,36 +171,254 @@ async def get_messages(user_id: str, conversation_id: str) -> list[dict]:
         .execute()
     )
     if not conv.data:
-        return []
+        return None
 
-    result = (
+    result = await (
         client.table("messages")
         .select("id, role, content, created_at")
         .eq("conversation_id", conversation_id)
         .order("created_at", desc=False)
         .execute()
     )
-    return result.data or []
+    messages = result.data or []
+    _remember_owner(conversation_id, user_id)
+    _read_cache.set(key, (user_id, messages), version)
+    return messages
+
+
+async def save_message(conversation_id: str, role: str, content: str, user_id: Optional[str] = None) -> dict:
+    client = await get_supabase_client()
+    with _timed_write("save_message"):
+        result = await client.table("messages").insert({
+            "conversation_id": conversation_id,
+            "role": role,
+            "content": content,
+        }).execute()
+
+        # Update conversation's updated_at
+        await client.table("conversations").update({
+            "updated_at": _now(),
+        }).eq("id", conversation_id).execute()
+
+    _invalidate_conversation(conversation_id, user_id)
+    return result.data[0] if result.data else {}
+
+
+async def update_conversation_title(conversation_id: str, title: str, user_id: Optional[str] = None) -> None:
+    client = await get_supabase_client()
+    with _timed_write("update_title"):
+        await client.table("conversations").update({
+            "title": title,
+        }).eq("id", conversation_id).execute()
+    _invalidate_conversation(conversation_id, user_id)
+
+
+# --- Write-behind persistence for chat messages ---
+#
+# The chat stream queues its messages and title updates here instead of
+# awaiting several round trips before the response closes. A background task
+# flushes everything queued across requests as one bulk insert plus one
+# updated_at update, and the queue is drained on shutdown.
+
+_pending_messages: list[dict] = []
+# The batch currently being written, still visible to pending_messages()
+_flushing_messages: list[dict] = []
+_pending_titles: dict[str, str] = {}
+# Owners of queued conversations, when the caller knew them
+_pending_owners: dict[str, str] = {}
+_flush_requested: Optional[asyncio.Event] = None
+_writer_task: Optional[asyncio.Task] = None
+_writer_stopping = False
+
+
+def _request_flush() -> None:
+    if _flush_requested is not None and len(_pending_messages) >= settings.db_flush_batch_size:
+        _flush_requested.set()
 
 
-async def save_message(conversation_id: str, role: str, content: str) -> dict:
-    client = get_supabase_client()
-    result = client.table("messages").insert({
+def _note_owner(conversation_id: str, user_id: Optional[str]) -> None:
+    if user_id is not None:
+        _pending_owners[conversation_id] = user_id
+
+
+def queue_message(conversation_id: str, role: str, content: str, user_id: Optional[str] = None) -> None:
+    """Queue a message for the next bulk insert."""
+    _pending_messages.append({
         "conversation_id": conversation_id,
         "role": role,
         "content": content,
-    }).execute()
+        # Stamped now so batched rows keep their order (a bulk insert shares one now())
+        "created_at": _now(),
+    })
+    _note_owner(conversation_id, user_id)
+    _invalidate_conversation(conversation_id, user_id)
+    if len(_pending_messages) > settings.db_max_pending_writes:
+        dropped = _pending_messages.pop(0)
+        logger.error("Write-behind queue full, dropped message for conv=%s", dropped["conversation_id"])
+    _request_flush()
 
-    # Update conversation's updated_at
-    client.table("conversations").update({
-        "updated_at": "now()",
-    }).eq("id", conversation_id).execute()
 
-    return result.data[0] if result.data else {}
+def pending_messages(conversation_id: str) -> list[dict]:
+    """Messages of a conversation that are queued or being written but may not be readable yet."""
+    return [m for m in _flushing_messages + _pending_messages if m["conversation_id"] == conversation_id]
+
+
+def queue_title(conversation_id: str, title: str, user_id: Optional[str] = None) -> None:
+    """Queue a conversation title update for the next flush."""
+    _pending_titles[conversation_id] = title
+    _note_owner(conversation_id, user_id)
+    _invalidate_conversation(conversation_id, user_id)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether a rejected write would be rejected again on retry.
+
+    PostgREST answers bad data (SQLSTATE class 22), constraint violations
+    (23), undefined columns or tables (42) and malformed requests (PGRST1xx,
+    PGRST2xx) with a 4xx; errors without a JSON body carry the HTTP status.
+    Everything else, network errors included, is worth retrying.
+    """
+    code = str(getattr(error, "code", None) or "")
+    if code.isdigit() and len(code) == 3:
+        return code.startswith("4")
+    return code[:2] in ("22", "23", "42") or code.startswith(("PGRST1", "PGRST2"))
+
+
+async def _insert_messages(
+    client: "AsyncClient",
+    messages: list[dict],
+    written: list[dict],
+    dropped: list[dict],
+) -> None:
+    """Insert messages in bulk; if the batch is rejected, per conversation, then per row.
+
+    Rows that can never be written are logged and dropped so one bad row does
+    not stall every other conversation. Rows are appended to ``written`` or
+    ``dropped`` as they settle, so a transient failure part-way retries only the rest.
+    """
+    try:
+        await client.table("messages").insert(messages).execute()
+        written.extend(messages)
+        return
+    except Exception as e:
+        if not _is_permanent(e):
+            raise
+        logger.warning("Bulk insert of %d messages rejected, retrying per conversation: %s", len(messages), e)
+
+    by_conversation: dict[str, list[dict]] = {}
+    for message in messages:
+        by_conversation.setdefault(message["conversation_id"], []).append(message)
+    for conversation_id, rows in by_conversation.items():
+        try:
+            await client.table("messages").insert(rows).execute()
+            written.extend(rows)
+            continue
+        except Exception as e:
+            if not _is_permanent(e):
+                raise
+        for row in rows:
+            try:
+                await client.table("messages").insert(row).execute()
+            except Exception as e:
+                if not _is_permanent(e):
+                    raise
+                logger.error("Dropping message for conv=%s that the database rejected: %s", conversation_id, e)
+                dropped.append(row)
+                continue
+            written.append(row)
+
+
+async def _update_titles(client: "AsyncClient", titles: dict[str, str], updated_at: str) -> None:
+    results = await asyncio.gather(*(
+        client.table("conversations")
+        .update({"title": title, "updated_at": updated_at})
+        .eq("id", conversation_id)
+        .execute()
+        for conversation_id, title in titles.items()
+    ), return_exceptions=True)
+    for conversation_id, result in zip(titles, results):
+        if isinstance(result, Exception):
+            if not _is_permanent(result):
+                raise result
+            logger.error("Dropping title update for conv=%s that the database rejected: %s", conversation_id, result)
+
+
+async def flush_writes() -> None:
+    """Write all queued messages and conversation updates in bulk."""
+    global _pending_messages, _pending_titles, _pending_owners, _flushing_messages
+    if not _pending_messages and not _pending_titles:
+        return
+
+    messages, titles, owners = _pending_messages, _pending_titles, _pending_owners
+    _pending_messages, _pending_titles, _pending_owners = [], {}, {}
+    _flushing_messages = messages
+    written: list[dict] = []
+    dropped: list[dict] = []
+    touched: set[str] = set()
+    updated_at = _now()
+
+    try:
+        client = await get_supabase_client()
+        with _timed_write("flush"):
+            if messages:
+                await _insert_messages(client, messages, written, dropped)
+            touched = {m["conversation_id"] for m in written} - titles.keys()
+            if touched:
+                await (
+                    client.table("conversations")
+                    .update({"updated_at": updated_at})
+                    .in_("id", sorted(touched))
+                    .execute()
+                )
+            await _update_titles(client, titles, updated_at)
+    except Exception as e:
+        settled = {id(m) for m in written + dropped}
+        remaining = [m for m in messages if id(m) not in settled]
+        logger.error("Failed to flush %d messages to DB, will retry: %s", len(remaining), e)
+        for conversation_id in {m["conversation_id"] for m in written}:
+            _invalidate_conversation(conversation_id, owners.get(conversation_id))
+        # Put the rest of the batch back in front of anything queued meanwhile
+        _pending_messages = remaining + _pending_messages
+        _pending_titles = {**titles, **_pending_titles}
+        _pending_owners = {**owners, **_pending_owners}
+        del _pending_messages[:-settings.db_max_pending_writes]
+        return
+    finally:
+        _flushing_messages = []
+
+    # Reads that ran between queueing and this flush may have cached pre-write data
+    for conversation_id in touched | titles.keys():
+        _invalidate_conversation(conversation_id, owners.get(conversation_id))
+
+    logger.info("Flushed %d messages (%d dropped) and %d conversation updates",
+                len(written), len(dropped), len(touched) + len(titles))
+
+
+async def _writer_loop() -> None:
+    while not _writer_stopping:
+        try:
+            await asyncio.wait_for(_flush_requested.wait(), settings.db_flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        _flush_requested.clear()
+        await flush_writes()
+
+
+def start_writer() -> None:
+    global _writer_task, _flush_requested, _writer_stopping
+    if _writer_task is None:
+        _writer_stopping = False
+        _flush_requested = asyncio.Event()
+        _writer_task = asyncio.create_task(_writer_loop())
 
 
-async def update_conversation_title(conversation_id: str, title: str) -> None:
-    client = get_supabase_client()
-    client.table("conversations").update({
-        "title": title,
-    }).eq("id", conversation_id).execute()
+async def stop_writer() -> None:
+    """Stop the background writer and flush whatever is still queued."""
+    global _writer_task, _writer_stopping
+    if _writer_task is not None:
+        # Let an in-progress flush finish rather than cancelling it mid-batch
+        _writer_stopping = True
+        _flush_requested.set()
+        await _writer_task
+        _writer_task = None
+    await flush_writes()
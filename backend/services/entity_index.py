@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import re
+from typing import Any, Optional
+
+from config import settings
+from services import intent_service
+from services.sports_service import SPORT_ENDPOINTS, get_live_scores
+
+
+logger = logging.getLogger("sportsgpt.entities")
+
+# Words that appear in many team names and say nothing about the sport
+GENERIC_WORDS = {"city", "united", "state", "team", "club", "county", "new", "north", "south",
+                 "east", "west", "saint", "real", "sporting", "athletic", "royal", "fc", "cf"}
+
+# Nicknames that are everyday words ("the heat is brutal", "was the game wild");
+# these teams only match by their full name
+COMMON_WORDS = {"heat", "magic", "wild", "jazz", "thunder", "suns", "spurs", "nets", "stars", "blues",
+                "flames", "lightning", "storm", "fever", "sparks", "dream", "liberty", "fire", "union",
+                "crew", "galaxy", "impact", "revolution", "twins", "reds", "rays", "giants", "saints",
+                "bills", "chiefs", "hurricanes", "athletics", "rockets", "warriors"}
+
+# Shorter abbreviations ("LA", "NY") name cities, not teams
+MIN_ABBREVIATION_LENGTH = 3
+
+# Team name/nickname (lowercase) -> sports, and capitalized abbreviation -> sports.
+# Entries accumulate across refreshes, since a scoreboard only lists teams
+# that played recently.
+_names: dict[str, set[str]] = {}
+_abbreviations: dict[str, set[str]] = {}
+_task: Optional[asyncio.Task] = None
+
+
+def team_names(display_name: str) -> list[str]:
+    """Full display name plus the nickname (last word) when it is distinctive."""
+    words = re.sub(r"[^\w ]+", " ", display_name.lower()).split()
+    names = [" ".join(words)] if words else []
+    if len(words) > 1 and len(words[-1]) >= 4 and words[-1] not in GENERIC_WORDS | COMMON_WORDS:
+        names.append(words[-1])
+    return names
+
+
+def observe(sport: str, games: list[Any]) -> None:
+    """Add the teams in a scoreboard to the index."""
+    for game in games:
+        for team, abbreviation in ((game.home_team, game.home_abbreviation),
+                                   (game.away_team, game.away_abbreviation)):
+            for name in team_names(team):
+                _names.setdefault(name, set()).add(sport)
+            if len(abbreviation) >= MIN_ABBREVIATION_LENGTH and abbreviation.isupper():
+                _abbreviations.setdefault(abbreviation, set()).add(sport)
+
+
+def get_index_stats() -> dict[str, int]:
+    return {
+        "names": len(_names),
+        "abbreviations": len(_abbreviations),
+        "ambiguous": sum(len(s) > 1 for s in _names.values()) + sum(len(s) > 1 for s in _abbreviations.values()),
+    }
+
+
+async def refresh_index() -> None:
+    """Rebuild the index from every sport's scoreboard and swap it into the intent matcher."""
+    sports = list(SPORT_ENDPOINTS)
+    results = await asyncio.gather(*(get_live_scores(sport) for sport in sports), return_exceptions=True)
+    for sport, result in zip(sports, results):
+        if isinstance(result, Exception):
+            logger.warning("Entity index could not load %s: %s", sport, result)
+        elif "games" in result:
+            observe(sport, result["games"])
+
+    intent_service.set_entities(
+        {name: set(s) for name, s in _names.items()},
+        {abbr: set(s) for abbr, s in _abbreviations.items()},
+    )
+    logger.info("Entity index refreshed: %s", get_index_stats())
+
+
+async def _run() -> None:
+    while True:
+        try:
+            await refresh_index()
+        except Exception as e:
+            logger.error("Entity index refresh failed: %s", e)
+        await asyncio.sleep(settings.entity_index_refresh_interval)
+
+
+def start_entity_index() -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run())
+
+
+async def stop_entity_index() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,79 @@
+import gzip
+import hashlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from config import settings
+
+
+# Preferred content codings, best first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class EncodedBody:
+    """A serialized response body with a content-derived strong ETag.
+
+    Compressed forms are made on first request for each coding and kept for
+    as long as the body is, so repeat hits neither re-serialize nor
+    re-compress. Each coding gets its own ETag (``"<digest>-gzip"``), as strong
+    validators must; ``If-None-Match`` matches any coding of the same content.
+    """
+
+    __slots__ = ("body", "digest", "_encoded")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self._encoded: dict[str, bytes] = {}
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """The coding to send for an Accept-Encoding header, or None for identity."""
+        if len(self.body) < settings.compress_min_bytes or not accept_encoding:
+            return None
+        accepted = _accepted(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in accepted or "*" in accepted:
+                return encoding
+        return None
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        data = self._encoded.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.body, quality=settings.brotli_quality)
+            else:
+                data = gzip.compress(self.body, compresslevel=settings.gzip_level, mtime=0)
+            self._encoded[encoding] = data
+        return data
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header names this content (in any coding)."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.removeprefix("W/").strip('"').split("-", 1)[0] == self.digest:
+                return True
+        return False
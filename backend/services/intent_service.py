@@ -0,0 +1,185 @@
+import re
+from typing import Optional
+
+from config import settings
+
+
+# Map keywords to sport identifiers
+SPORT_KEYWORDS: dict[str, list[str]] = {
+    "nfl": ["nfl", "football", "touchdown", "quarterback", "super bowl"],
+    "nba": ["nba", "basketball", "lakers", "celtics", "warriors", "dunk"],
+    "mlb": ["mlb", "baseball", "home run", "pitcher", "world series"],
+    "nhl": ["nhl", "hockey", "puck", "stanley cup"],
+    "soccer": ["soccer", "football", "premier league", "epl", "goal", "messi", "ronaldo", "fifa"],
+    "ncaaf": ["college football", "ncaaf", "cfb"],
+    "ncaab": ["college basketball", "ncaab", "march madness"],
+    "cricket": ["cricket", "test match", "odi", "t20", "wicket", "batsman", "bowler", "innings"],
+    "ipl": ["ipl", "indian premier league"],
+    "bbl": ["bbl", "big bash"],
+    "psl": ["psl", "pakistan super league"],
+    "cpl": ["cpl", "caribbean premier league"],
+    "the_hundred": ["the hundred", "hundred cricket"],
+    "sa20": ["sa20"],
+    "county": ["county cricket", "county championship"],
+}
+
+# Phrases that mean the user wants scoreboard data
+SCORE_KEYWORDS = ["score", "scores", "game", "games", "playing", "play today",
+                  "who won", "who's winning", "result", "results", "live",
+                  "today", "tonight", "yesterday", "this week", "standings",
+                  "last night", "last week", "this weekend", "last weekend"]
+
+# Phrases that mean the answer needs a web search for recent info
+SEARCH_KEYWORDS = ["who won", "latest", "recent", "current", "news", "trade",
+                   "injury", "update", "transfer", "rumor", "champion", "winner",
+                   "standings", "ranking", "draft", "signing", "contract",
+                   "fired", "hired", "coach", "manager", "2025", "2026"]
+
+# Dropped when normalizing queries into cache keys
+STOPWORDS = {"a", "an", "the", "is", "are", "was", "were", "did", "do", "does", "of", "in",
+             "on", "at", "to", "for", "and", "or", "me", "tell", "what", "whats", "please"}
+
+SCORE = "score"
+SEARCH = "search"
+
+
+class Intent:
+    __slots__ = ("sports", "is_score_query", "is_search_query")
+
+    def __init__(self, sports: list[str], is_score_query: bool, is_search_query: bool):
+        self.sports = sports
+        self.is_score_query = is_score_query
+        self.is_search_query = is_search_query
+
+    def __repr__(self) -> str:
+        return (f"Intent(sports={self.sports}, score={self.is_score_query}, "
+                f"search={self.is_search_query})")
+
+
+class IntentMatcher:
+    """Single-pass matcher for sports, teams, score intent and search intent.
+
+    All phrases are compiled into one word-bounded regex (longest phrase
+    first, optional plural "s"), so "odi" no longer matches inside "periodic"
+    and "college football" is not also read as "football". Team names match
+    in any case; team abbreviations only when written in capitals.
+
+    A team that belongs to one sport routes the question to that sport.
+    Sport-ambiguous words ("football", or a team name used in two leagues)
+    only fetch every sport they could mean when nothing else in the message
+    pins the sport down.
+    """
+
+    def __init__(
+        self,
+        sport_keywords: dict[str, list[str]],
+        score_keywords: list[str],
+        search_keywords: list[str],
+        entities: Optional[dict[str, set[str]]] = None,
+        abbreviations: Optional[dict[str, set[str]]] = None,
+    ):
+        labels: dict[str, set[str]] = {}
+        for sport, keywords in sport_keywords.items():
+            for kw in keywords:
+                labels.setdefault(kw.lower(), set()).add(sport)
+        for kw in score_keywords:
+            labels.setdefault(kw.lower(), set()).add(SCORE)
+        for kw in search_keywords:
+            labels.setdefault(kw.lower(), set()).add(SEARCH)
+
+        self._labels = labels
+        self._entities = entities or {}
+        # Matched on lowercased text, then checked against the original capitals
+        self._abbreviations = {abbr.lower(): (abbr, sports) for abbr, sports in (abbreviations or {}).items()}
+        self._sport_order = {sport: i for i, sport in enumerate(sport_keywords)}
+
+        phrases = sorted(labels.keys() | self._entities.keys() | self._abbreviations.keys(),
+                         key=len, reverse=True)
+        self._pattern = re.compile(r"\b(" + "|".join(map(re.escape, phrases)) + r")s?\b")
+
+    def match(self, text: str) -> Intent:
+        lowered = text.lower()
+        # Some characters change length when lowercased; skip abbreviations then
+        check_case = len(lowered) == len(text)
+
+        found: set[str] = set()
+        ambiguous: set[str] = set()
+        teams: set[str] = set()
+        for m in self._pattern.finditer(lowered):
+            phrase = m.group(1)
+            labels = self._labels.get(phrase)
+            if labels:
+                sports = labels - {SCORE, SEARCH}
+                found |= labels - sports
+                if len(sports) > 1:
+                    ambiguous |= sports
+                else:
+                    found |= sports
+
+            team_sports = self._entities.get(phrase, set())
+            abbreviation = self._abbreviations.get(phrase)
+            if abbreviation and check_case and text[m.start(1):m.end(1)] == abbreviation[0]:
+                team_sports = team_sports | abbreviation[1]
+            if len(team_sports) == 1:
+                teams |= team_sports
+            elif team_sports:
+                ambiguous |= team_sports
+
+        is_score = SCORE in found
+        is_search = SEARCH in found
+        found.discard(SCORE)
+        found.discard(SEARCH)
+        found |= teams
+        if not found & ambiguous:
+            found |= ambiguous
+        sports = sorted(found, key=lambda sport: self._sport_order.get(sport, len(self._sport_order)))
+        return Intent(sports, is_score, is_search)
+
+
+def _build_matcher(
+    extra: Optional[dict[str, list[str]]] = None,
+    entities: Optional[dict[str, set[str]]] = None,
+    abbreviations: Optional[dict[str, set[str]]] = None,
+) -> IntentMatcher:
+    """Build the matcher, merging extra keywords from config.
+
+    ``extra`` maps a sport id, "score" or "search" to additional phrases.
+    """
+    sport_keywords = {sport: list(kws) for sport, kws in SPORT_KEYWORDS.items()}
+    score_keywords = list(SCORE_KEYWORDS)
+    search_keywords = list(SEARCH_KEYWORDS)
+    for label, keywords in (extra or {}).items():
+        if label == SCORE:
+            score_keywords.extend(keywords)
+        elif label == SEARCH:
+            search_keywords.extend(keywords)
+        else:
+            sport_keywords.setdefault(label, []).extend(keywords)
+    return IntentMatcher(sport_keywords, score_keywords, search_keywords, entities, abbreviations)
+
+
+def normalize_query(text: str) -> str:
+    """Normalize a question into a cache key.
+
+    Lowercases, strips punctuation and stopwords and sorts the remaining
+    tokens, so "Who won the Super Bowl?" and "super bowl: who won" collide.
+    """
+    tokens = re.findall(r"[a-z0-9]+", text.lower().replace("'", ""))
+    return " ".join(sorted(t for t in tokens if t not in STOPWORDS))
+
+
+_matcher = _build_matcher(settings.intent_extra_keywords)
+
+
+def set_entities(entities: dict[str, set[str]], abbreviations: dict[str, set[str]]) -> None:
+    """Swap in a matcher that also knows the given team names and abbreviations.
+
+    ``entities`` maps lowercase team names to sports, ``abbreviations`` maps
+    capitalized abbreviations to sports.
+    """
+    global _matcher
+    _matcher = _build_matcher(settings.intent_extra_keywords, entities, abbreviations)
+
+
+def match_intent(text: str) -> Intent:
+    return _matcher.match(text)
@@ -0,0 +1,184 @@
+import math
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+# Latency buckets (seconds) shared by the pipeline stage histograms
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_metrics: list["_Metric"] = []
+_collectors: list[Callable[[], dict[str, dict[tuple[tuple[str, str], ...], float]]]] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        _metrics.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+        return tuple((name, str(labels.get(name, ""))) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels -> [bucket counts..., sum, count]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        data = self._values.get(key)
+        if data is None:
+            data = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[i] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, data in self._values.items():
+            for bound, count in zip(self.buckets, data):
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(key + le)} {_format_value(count)}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(data[-1])}")
+        return lines
+
+
+def register_collector(
+    collect: Callable[[], dict[str, dict[tuple[tuple[str, str], ...], float]]],
+) -> None:
+    """Register a callback rendered as gauges at scrape time.
+
+    The callback returns ``{metric_name: {label_pairs: value}}``.
+    """
+    _collectors.append(collect)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        for name, samples in collect().items():
+            lines.append(f"# TYPE {name} gauge")
+            for key, value in samples.items():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Chat pipeline metrics ---
+
+SCOREBOARD_FETCH_SECONDS = Histogram(
+    "sportsgpt_scoreboard_fetch_seconds", "ESPN scoreboard fetch and parse time", ("sport",))
+WEB_SEARCH_SECONDS = Histogram(
+    "sportsgpt_web_search_seconds", "Tavily web search time")
+GEMINI_TTFT_SECONDS = Histogram(
+    "sportsgpt_gemini_ttft_seconds", "Time to the first Gemini chunk", ("sport",))
+GEMINI_GENERATION_SECONDS = Histogram(
+    "sportsgpt_gemini_generation_seconds", "Total Gemini generation time", ("sport",))
+GEMINI_OUTPUT_CHARS_PER_SECOND = Histogram(
+    "sportsgpt_gemini_output_chars_per_second", "Gemini output throughput", ("sport",),
+    buckets=(25, 50, 100, 200, 400, 800, 1600, 3200))
+DB_WRITE_SECONDS = Histogram(
+    "sportsgpt_db_write_seconds", "Supabase write time", ("operation",))
+UPSTREAM_ERRORS = Counter(
+    "sportsgpt_upstream_errors_total", "Failed upstream calls", ("upstream",))
+INFLIGHT_STREAMS = Gauge(
+    "sportsgpt_inflight_streams", "Chat responses currently streaming")
+
+# --- Admission control ---
+
+CHAT_ACTIVE = Gauge(
+    "sportsgpt_chat_active", "Chat generations holding an admission slot")
+CHAT_QUEUE_DEPTH = Gauge(
+    "sportsgpt_chat_queue_depth", "Chat requests waiting for an admission slot")
+CHAT_QUEUE_WAIT_SECONDS = Histogram(
+    "sportsgpt_chat_queue_wait_seconds", "Time chat requests waited for a slot")
+CHAT_SHED = Counter(
+    "sportsgpt_chat_shed_total", "Chat requests rejected by admission control", ("reason",))
+CHAT_DEGRADED = Counter(
+    "sportsgpt_chat_degraded_total", "Chat requests served with reduced context or output", ("level",))
+
+# --- Upstream resilience ---
+
+UPSTREAM_BREAKER_STATE = Gauge(
+    "sportsgpt_upstream_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ("upstream",))
+UPSTREAM_SHORT_CIRCUITS = Counter(
+    "sportsgpt_upstream_short_circuits_total", "Calls failed fast by an open circuit breaker", ("upstream",))
+UPSTREAM_HEDGES = Counter(
+    "sportsgpt_upstream_hedges_total", "Hedged second requests sent", ("upstream",))
+UPSTREAM_HEDGE_WINS = Counter(
+    "sportsgpt_upstream_hedge_wins_total", "Hedged requests that answered before the original", ("upstream",))
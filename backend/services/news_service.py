@@ -1,12 +1,15 @@
+import asyncio
+import importlib.util
+import json
 import logging
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
 
 import httpx
 
-try:
-    import feedparser
-except ImportError:
-    feedparser = None  # type: ignore
+from config import settings
+from services import resources
+from services.upstream import Upstream
 
 
 logger = logging.getLogger("sportsgpt.news")
@@ -19,40 +22,181 @@ ESPN_RSS_FEEDS = {
     "soccer": "https://www.espn.com/espn/rss/soccer/news",
 }
 
+# Conditional GET validators per feed: (ETag, Last-Modified)
+_validators: dict[str, tuple[str, str]] = {}
+# Parsed articles per feed, in feed order
+_feed_articles: dict[str, list[dict[str, Any]]] = {}
+# Deduplicated views: one per feed plus the merged "all" view
+_snapshot: dict[str, list[dict[str, Any]]] = {}
+# Serialized /api/news bodies for the current snapshot, keyed by (view, count)
+_rendered: dict[tuple[str, int], bytes] = {}
 
-async def get_trending_news(count: int = 4) -> list[dict[str, Any]]:
-    """Fetch trending sports headlines from ESPN RSS."""
-    if feedparser is None:
-        logger.warning("feedparser not installed, news disabled")
-        return []
+_espn_rss = Upstream("espn_rss")
 
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(ESPN_RSS_FEEDS["top"])
+# feedparser is imported on first parse, in the worker thread
+NEWS_AVAILABLE = importlib.util.find_spec("feedparser") is not None
+
+_refresh_task: Optional[asyncio.Task] = None
+_aggregator_task: Optional[asyncio.Task] = None
+
+
+def _parse_feed(text: str) -> list[dict[str, Any]]:
+    import feedparser
+
+    feed = feedparser.parse(text)
+    articles = []
+    for entry in feed.entries:
+        # Extract image from media content if available
+        image = ""
+        if hasattr(entry, "media_content") and entry.media_content:
+            image = entry.media_content[0].get("url", "")
+        elif hasattr(entry, "media_thumbnail") and entry.media_thumbnail:
+            image = entry.media_thumbnail[0].get("url", "")
+
+        articles.append({
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", "")[:150],
+            "link": entry.get("link", ""),
+            "image": image,
+            "published": entry.get("published", ""),
+        })
+    return articles
+
+
+async def _fetch_feed(name: str, url: str) -> bool:
+    """Fetch one feed with a conditional GET. Returns True if its articles changed."""
+    headers = {}
+    # Revalidate only what we hold; a 304 for a feed with no articles would keep it empty
+    etag, last_modified = _validators.get(name, ("", "")) if name in _feed_articles else ("", "")
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    async def get() -> httpx.Response:
+        response = await resources.get_http().get(url, headers=headers)
+        # 304 Not Modified is a healthy answer to a conditional GET
+        if response.status_code != 304:
             response.raise_for_status()
+        return response
+
+    # While the breaker is open the feed keeps its last good articles
+    response = await _espn_rss.call(get, hedge=True)
+    if response.status_code == 304:
+        return False
+
+    # feedparser is pure Python; keep it off the event loop
+    _feed_articles[name] = await asyncio.to_thread(_parse_feed, response.text)
+    # Only once the body is parsed and cached, so a failed parse is fetched in full again
+    _validators[name] = (response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""))
+    return True
+
+
+def _article_key(article: dict[str, Any]) -> str:
+    return article["link"].split("?", 1)[0].rstrip("/") or article["title"].strip().lower()
+
+
+def _published(article: dict[str, Any]) -> float:
+    try:
+        return parsedate_to_datetime(article["published"]).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
 
-        feed = feedparser.parse(response.text)
-        articles = []
-
-        for entry in feed.entries[:count]:
-            # Extract image from media content if available
-            image = ""
-            if hasattr(entry, "media_content") and entry.media_content:
-                image = entry.media_content[0].get("url", "")
-            elif hasattr(entry, "media_thumbnail") and entry.media_thumbnail:
-                image = entry.media_thumbnail[0].get("url", "")
-
-            articles.append({
-                "title": entry.get("title", ""),
-                "summary": entry.get("summary", "")[:150],
-                "link": entry.get("link", ""),
-                "image": image,
-                "published": entry.get("published", ""),
-            })
-
-        logger.info("Fetched %d trending news articles", len(articles))
-        return articles
-
-    except Exception as e:
-        logger.error("Failed to fetch trending news: %s", e)
+
+def _dedupe(articles: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    seen: set[str] = set()
+    unique = []
+    for article in articles:
+        key = _article_key(article)
+        if key not in seen:
+            seen.add(key)
+            unique.append(article)
+    return unique
+
+
+def _rebuild_snapshot() -> None:
+    global _snapshot, _rendered
+    snapshot = {name: _dedupe(articles) for name, articles in _feed_articles.items()}
+    # Top stories keep their editorial order; sport feeds fill in by recency
+    rest = [a for name, articles in snapshot.items() if name != "top" for a in articles]
+    rest.sort(key=_published, reverse=True)
+    snapshot["all"] = _dedupe(snapshot.get("top", []) + rest)
+    _snapshot, _rendered = snapshot, {}
+
+
+async def refresh_feeds() -> None:
+    """Fetch every configured feed concurrently and rebuild the snapshot if any changed."""
+    results = await asyncio.gather(
+        *(_fetch_feed(name, url) for name, url in ESPN_RSS_FEEDS.items()),
+        return_exceptions=True,
+    )
+    changed = False
+    for name, result in zip(ESPN_RSS_FEEDS, results):
+        if isinstance(result, Exception):
+            logger.warning("Failed to fetch %s news feed: %s", name, result)
+        else:
+            changed |= result
+    if changed or not _snapshot:
+        _rebuild_snapshot()
+        logger.info("News snapshot rebuilt: %d articles across %d feeds",
+                    len(_snapshot.get("all", [])), len(_feed_articles))
+
+
+async def _ensure_snapshot() -> None:
+    """Make sure a snapshot exists, sharing one refresh between concurrent callers."""
+    global _refresh_task
+    if _snapshot or not NEWS_AVAILABLE:
+        return
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(refresh_feeds())
+    await asyncio.shield(_refresh_task)
+
+
+async def get_trending_news(count: int = 4, sport: Optional[str] = None) -> list[dict[str, Any]]:
+    """Trending sports headlines from the in-memory snapshot."""
+    if not NEWS_AVAILABLE:
+        logger.warning("feedparser not installed, news disabled")
         return []
+    await _ensure_snapshot()
+    return _snapshot.get(sport or "all", [])[:count]
+
+
+async def get_trending_news_bytes(count: int = 4, sport: Optional[str] = None) -> bytes:
+    """The serialized /api/news body, reused across requests until the snapshot changes."""
+    key = (sport or "all", count)
+    body = _rendered.get(key)
+    if body is None:
+        articles = await get_trending_news(count, sport)
+        body = json.dumps({"articles": articles}).encode()
+        if _snapshot:
+            _rendered[key] = body
+    return body
+
+
+async def _aggregate() -> None:
+    while True:
+        try:
+            await refresh_feeds()
+        except Exception as e:
+            logger.error("News aggregation failed: %s", e)
+        await asyncio.sleep(settings.news_refresh_interval)
+
+
+def start_aggregator() -> None:
+    global _aggregator_task
+    if not NEWS_AVAILABLE:
+        logger.warning("feedparser not installed, news disabled")
+        return
+    if _aggregator_task is None:
+        _aggregator_task = asyncio.create_task(_aggregate())
+
+
+async def stop_aggregator() -> None:
+    global _aggregator_task
+    if _aggregator_task is not None:
+        _aggregator_task.cancel()
+        try:
+            await _aggregator_task
+        except asyncio.CancelledError:
+            pass
+        _aggregator_task = None
@@ -0,0 +1,167 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+import httpx
+
+from config import settings
+
+if TYPE_CHECKING:
+    from google import genai
+    from supabase import AsyncClient
+
+
+logger = logging.getLogger("sportsgpt.resources")
+
+# Clients shared by every request, created once and closed with the app.
+# google.genai (~1s) and supabase (~0.2s) are only imported when their client
+# is first built, which the background warm-up does right after startup.
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+GEMINI_URL = os.getenv("GOOGLE_GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/")
+
+_http: Optional[httpx.AsyncClient] = None
+_search_http: Optional[httpx.AsyncClient] = None
+_gemini: Optional["genai.Client"] = None
+_supabase: Optional["AsyncClient"] = None
+_supabase_lock = asyncio.Lock()
+_search: Any = None
+
+_warmup_task: Optional[asyncio.Task] = None
+_ready = False
+_warmup: dict[str, Any] = {}
+
+
+def _new_http() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=HTTP2,
+        timeout=10,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=60),
+    )
+
+
+def get_http() -> httpx.AsyncClient:
+    """The pooled HTTP client shared by ESPN, the RSS feeds, JWKS, Gemini and Supabase."""
+    global _http
+    if _http is None:
+        _http = _new_http()
+    return _http
+
+
+def get_gemini() -> "genai.Client":
+    global _gemini
+    if _gemini is None:
+        from google import genai
+
+        logger.info("Initializing Gemini client")
+        _gemini = genai.Client(
+            api_key=settings.gemini_api_key,
+            # Streams can idle longer than the shared client's 10s default between chunks
+            http_options={"httpx_async_client": get_http(), "timeout": 60_000},
+        )
+    return _gemini
+
+
+async def get_supabase() -> "AsyncClient":
+    """The service-role Supabase client (bypasses RLS)."""
+    global _supabase
+    if _supabase is None:
+        async with _supabase_lock:
+            if _supabase is None:
+                from supabase import AsyncClientOptions, acreate_client
+
+                logger.info("Initializing Supabase client")
+                _supabase = await acreate_client(
+                    settings.supabase_url,
+                    settings.supabase_service_role_key,
+                    options=AsyncClientOptions(httpx_client=get_http()),
+                )
+    return _supabase
+
+
+def get_search() -> Any:
+    """The Tavily client, or None if search is not configured."""
+    global _search, _search_http
+    if _search is None and settings.tavily_api_key:
+        try:
+            from tavily import AsyncTavilyClient
+        except ImportError:
+            logger.warning("tavily-python not installed, web search disabled")
+            return None
+        # Tavily sets its API key header on the client it is given, so it gets its own pool
+        _search_http = _new_http()
+        _search = AsyncTavilyClient(api_key=settings.tavily_api_key, client=_search_http)
+    return _search
+
+
+async def _warm(name: str, step) -> None:
+    start = time.monotonic()
+    try:
+        await step()
+        _warmup[name] = round(time.monotonic() - start, 3)
+    except Exception as e:
+        _warmup[name] = f"failed: {e}"
+        logger.warning("Warm-up of %s failed: %s", name, e)
+
+
+async def _open_connection(url: str) -> None:
+    # Any response will do: it leaves a connected (TLS, HTTP/2) socket in the pool
+    await get_http().head(url)
+
+
+async def _warm_up() -> None:
+    global _ready
+    from services.sports_service import BASE_URL
+
+    start = time.monotonic()
+    steps = [_warm("espn_connection", lambda: _open_connection(BASE_URL))]
+    if settings.gemini_api_key:
+        # Import and build in a thread so the event loop keeps serving meanwhile
+        steps.append(_warm("gemini_client", lambda: asyncio.to_thread(get_gemini)))
+        steps.append(_warm("gemini_connection", lambda: _open_connection(GEMINI_URL)))
+    if settings.supabase_url:
+        steps.append(_warm("supabase_client", get_supabase))
+    if settings.tavily_api_key:
+        steps.append(_warm("search_client", lambda: asyncio.to_thread(get_search)))
+    await asyncio.gather(*steps)
+    _warmup["total"] = round(time.monotonic() - start, 3)
+    _ready = True
+    logger.info("Warm-up finished in %.2fs: %s", _warmup["total"], _warmup)
+
+
+def start_resources() -> None:
+    """Create the shared HTTP client and warm the other clients and connections in the background."""
+    global _warmup_task
+    get_http()
+    if _warmup_task is None:
+        _warmup_task = asyncio.create_task(_warm_up())
+
+
+async def stop_resources() -> None:
+    global _http, _search_http, _gemini, _supabase, _search, _warmup_task, _ready
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+        _warmup_task = None
+    # Gemini and Supabase ride on the shared client, so closing it closes them too
+    for client in (_http, _search_http):
+        if client is not None:
+            await client.aclose()
+    _http = _search_http = _gemini = _supabase = _search = None
+    _ready = False
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def get_status() -> dict[str, Any]:
+    return {"ready": _ready, "http2": HTTP2, "warmup_seconds": dict(_warmup)}
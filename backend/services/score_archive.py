@@ -0,0 +1,81 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from datetime import date
+from typing import Any, Optional
+
+from config import settings
+from services.cache_service import LRUCache
+
+
+logger = logging.getLogger("sportsgpt.archive")
+
+# Scoreboards for days where every game is final never change, so they are
+# kept on disk and never fetched again.
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+# Recently used days in front of SQLite: (sport, day) -> list of game dicts
+_memory = LRUCache("archive", settings.scores_archive_memory_size)
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(settings.scores_archive_path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS scoreboards ("
+            " sport TEXT NOT NULL, day TEXT NOT NULL, games TEXT NOT NULL,"
+            " PRIMARY KEY (sport, day))"
+        )
+        _conn.commit()
+    return _conn
+
+
+def _load(sport: str, day: str) -> Optional[str]:
+    with _lock:
+        row = _connect().execute(
+            "SELECT games FROM scoreboards WHERE sport = ? AND day = ?", (sport, day)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _store(sport: str, day: str, games: str) -> None:
+    with _lock:
+        conn = _connect()
+        conn.execute("INSERT OR REPLACE INTO scoreboards (sport, day, games) VALUES (?, ?, ?)",
+                     (sport, day, games))
+        conn.commit()
+
+
+async def get_archived(sport: str, day: date) -> Optional[list[dict[str, Any]]]:
+    """Return the archived games for a finished day, or None if not archived."""
+    key = (sport, day.isoformat())
+    games = _memory.get(key)
+    if games is None:
+        raw = await asyncio.to_thread(_load, *key)
+        if raw is None:
+            return None
+        games = json.loads(raw)
+        _memory.set(key, games)
+    return games
+
+
+async def archive(sport: str, day: date, games: list[dict[str, Any]]) -> None:
+    """Store the games of a day on which every game is final."""
+    key = (sport, day.isoformat())
+    _memory.set(key, games)
+    try:
+        await asyncio.to_thread(_store, *key, json.dumps(games))
+    except sqlite3.Error as e:
+        logger.warning("Failed to archive %s %s: %s", sport, day, e)
+
+
+def close_archive() -> None:
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from config import settings
+from services.sports_service import Game, has_live_games, refresh_scores
+
+
+logger = logging.getLogger("sportsgpt.poller")
+
+# Fields whose changes are pushed to subscribers
+TRACKED_FIELDS = ("status", "home_score", "away_score", "home_innings", "away_innings")
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+_subscribers: dict[str, set[asyncio.Queue]] = {}
+_games: dict[str, dict[str, Game]] = {}
+_next_poll: dict[str, float] = {}
+_wakeup: Optional[asyncio.Event] = None
+_task: Optional[asyncio.Task] = None
+
+
+def _game_key(game: Game) -> str:
+    return game.id or f"{game.name}|{game.start_time}"
+
+
+def subscribe(sports: list[str]) -> asyncio.Queue:
+    """Register a subscriber queue for score updates of the given sports."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    for sport in sports:
+        if not _subscribers.get(sport):
+            # First subscriber for this sport: poll it on the next tick
+            _next_poll[sport] = 0.0
+        _subscribers.setdefault(sport, set()).add(queue)
+    if _wakeup is not None:
+        _wakeup.set()
+    return queue
+
+
+def unsubscribe(queue: asyncio.Queue, sports: list[str]) -> None:
+    for sport in sports:
+        queues = _subscribers.get(sport)
+        if queues is None:
+            continue
+        queues.discard(queue)
+        if not queues:
+            del _subscribers[sport]
+            _games.pop(sport, None)
+            _next_poll.pop(sport, None)
+
+
+def seed(sport: str, games: list[Game]) -> None:
+    """Use a snapshot sent to a subscriber as the baseline for the first poll."""
+    if sport in _subscribers and sport not in _games:
+        _games[sport] = {_game_key(game): game for game in games}
+
+
+def subscriber_count() -> dict[str, int]:
+    return {sport: len(queues) for sport, queues in _subscribers.items()}
+
+
+def _diff(sport: str, games: list[Game]) -> list[dict[str, Any]]:
+    """Compare a fresh scoreboard with the last one and return per-game changes."""
+    previous = _games.get(sport)
+    current = {_game_key(game): game for game in games}
+    _games[sport] = current
+    if previous is None:
+        return []
+
+    updates = []
+    for key, game in current.items():
+        old = previous.get(key)
+        if old is None:
+            updates.append({"sport": sport, "id": key, "game": game.to_dict()})
+            continue
+        changes = {
+            field: game.get(field)
+            for field in TRACKED_FIELDS
+            if game.get(field) != old.get(field)
+        }
+        if changes:
+            updates.append({"sport": sport, "id": key, "changes": changes})
+    for key in previous.keys() - current.keys():
+        updates.append({"sport": sport, "id": key, "removed": True})
+    return updates
+
+
+def _publish(sport: str, update: dict[str, Any]) -> None:
+    for queue in list(_subscribers.get(sport, ())):
+        if queue.full():
+            # Slow consumer: drop its oldest update rather than block the poller
+            queue.get_nowait()
+        queue.put_nowait(update)
+
+
+async def _poll(sport: str) -> None:
+    try:
+        result = await refresh_scores(sport)
+    except Exception as e:
+        logger.warning("Poll failed for %s: %s", sport, e)
+        _next_poll[sport] = time.monotonic() + settings.poller_live_interval
+        return
+
+    if sport not in _subscribers:
+        return
+    updates = _diff(sport, result.get("games", []))
+    for update in updates:
+        _publish(sport, update)
+    if updates:
+        logger.info("Pushed %d %s updates to %d subscribers",
+                    len(updates), sport, len(_subscribers.get(sport, ())))
+
+    interval = settings.poller_live_interval if has_live_games(result) else settings.poller_idle_interval
+    _next_poll[sport] = time.monotonic() + interval
+
+
+async def _run() -> None:
+    while True:
+        now = time.monotonic()
+        due = [sport for sport in _subscribers if _next_poll.get(sport, 0.0) <= now]
+        if due:
+            await asyncio.gather(*(_poll(sport) for sport in due))
+
+        pending = [_next_poll[sport] for sport in _subscribers if sport in _next_poll]
+        timeout = max(0.0, min(pending) - time.monotonic()) if pending else None
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_poller() -> None:
+    global _task, _wakeup
+    if _task is None:
+        _wakeup = asyncio.Event()
+        _task = asyncio.create_task(_run())
+        logger.info("Scoreboard poller started")
+
+
+async def stop_poller() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        logger.info("Scoreboard poller stopped")
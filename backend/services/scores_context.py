@@ -0,0 +1,104 @@
+import logging
+import re
+from typing import Any, Optional
+
+from config import settings
+from services.context_window import estimate_tokens
+from services.entity_index import MIN_ABBREVIATION_LENGTH, team_names
+from services.sports_service import LIVE_STATUSES, Game
+
+
+logger = logging.getLogger("sportsgpt.scores_context")
+
+
+def _normalize(text: str) -> str:
+    # Same word splitting as entity_index.team_names
+    words = re.sub(r"[^\w ]+", " ", text.lower()).split()
+    return f" {' '.join(words)} "
+
+
+def _mentions(game: Game, text: str, raw: str) -> bool:
+    for team, abbreviation in ((game.home_team, game.home_abbreviation),
+                               (game.away_team, game.away_abbreviation)):
+        if any(f" {term} " in text for term in team_names(team)):
+            return True
+        # Abbreviations only count when written in capitals ("LAL", not "was")
+        if len(abbreviation) >= MIN_ABBREVIATION_LENGTH and re.search(rf"\b{re.escape(abbreviation)}\b", raw):
+            return True
+    return False
+
+
+def _format_game(game: Game) -> str:
+    return f"  {game.away_team} {game.away_score} @ {game.home_team} {game.home_score} ({game.status})"
+
+
+def format_scores_context(scores_data: list[dict[str, Any]]) -> str:
+    parts = []
+    for data in scores_data:
+        sport = data.get("sport", "").upper()
+        games = data.get("games", [])
+        if not games:
+            parts.append(f"\n{sport}: No games currently scheduled.")
+            continue
+
+        parts.append(f"\n{sport} Scores:")
+        for game in games:
+            parts.append(_format_game(game))
+
+    return "\n".join(parts)
+
+
+def build_scores_context(
+    scores_data: list[dict[str, Any]],
+    message: str,
+    token_budget: Optional[int] = None,
+) -> str:
+    """Format only the games relevant to the message, within a token budget.
+
+    Games whose teams are named in the message (full name, distinctive
+    nickname or capitalized abbreviation, as in the entity index) are kept
+    and the rest dropped. A generic
+    question keeps every game, live ones first. Either way the block is
+    capped at ``token_budget`` tokens.
+    """
+    if token_budget is None:
+        token_budget = settings.scores_context_token_budget
+    text = _normalize(message)
+
+    mentioned = [
+        (data["sport"], game)
+        for data in scores_data
+        for game in data.get("games", [])
+        if _mentions(game, text, message)
+    ]
+    if mentioned:
+        ranked = mentioned
+    else:
+        ranked = [(data["sport"], game) for data in scores_data for game in data.get("games", [])]
+        # Stable sort keeps each sport's scheduled/final order behind live games
+        ranked.sort(key=lambda item: item[1].status not in LIVE_STATUSES)
+
+    selected: dict[str, list[Game]] = {data["sport"]: [] for data in scores_data}
+    used = 0
+    kept = 0
+    for sport, game in ranked:
+        cost = estimate_tokens(_format_game(game))
+        if used + cost > token_budget:
+            break
+        selected[sport].append(game)
+        used += cost
+        kept += 1
+
+    total = sum(len(data.get("games", [])) for data in scores_data)
+    if kept < total:
+        logger.info("Scores context: kept %d/%d games (%s), dropped %d",
+                    kept, total, "mentioned" if mentioned else "generic", total - kept)
+
+    trimmed = []
+    for data in scores_data:
+        games = selected[data["sport"]]
+        if data.get("games") and not games:
+            # Nothing relevant from this sport; don't claim it has no games
+            continue
+        trimmed.append({"sport": data["sport"], "games": games})
+    return format_scores_context(trimmed)
@@ -1,22 +1,38 @@
 import logging
+import time
+from typing import Any
 
 from config import settings
+from services import resources
+from services.cache_service import TTLCache
+from services.intent_service import normalize_query
+from services.metrics import UPSTREAM_ERRORS, WEB_SEARCH_SECONDS
+from services.upstream import Upstream
 
 
 logger = logging.getLogger("sportsgpt.search")
 
-_client = None
+# Formatted search context keyed by (normalized query, max_results)
+_search_cache = TTLCache("search", max_entries=settings.search_cache_size)
+_upstream_seconds = 0.0
+
+# Searches are POSTs that cost quota, so Tavily gets a breaker but no hedging
+_tavily = Upstream("tavily")
 
 
 def _get_client():
-    global _client
-    if _client is None and settings.tavily_api_key:
-        try:
-            from tavily import TavilyClient
-            _client = TavilyClient(api_key=settings.tavily_api_key)
-        except ImportError:
-            logger.warning("tavily-python not installed, web search disabled")
-    return _client
+    return resources.get_search()
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """Search cache counters plus the upstream time saved by cache hits."""
+    stats = _search_cache.stats()
+    fetches = stats["fetches"] - stats["errors"]
+    avg_latency = _upstream_seconds / fetches if fetches else 0.0
+    served_without_fetch = stats["hits"] + stats["stale_hits"] + stats["misses"] - stats["fetches"]
+    stats["avg_upstream_seconds"] = round(avg_latency, 3)
+    stats["saved_upstream_seconds"] = round(served_without_fetch * avg_latency, 3)
+    return stats
 
 
 async def web_search(query: str, max_results: int = 5) -> str:
@@ -26,33 +42,53 @@ async def web_search(query: str, max_results: int = 5) -> str:
         logger.warning("Tavily API key not configured, skipping web search")
         return ""
 
+    key = (normalize_query(query), max_results)
     try:
-        logger.info("Web search: '%s'", query[:100])
-        response = client.search(
+        return await _search_cache.get_or_fetch(
+            key,
+            lambda: _tavily.call(lambda: _search(client, query, max_results)),
+            ttl=settings.search_cache_ttl,
+            allow_stale=False,
+        )
+    except Exception as e:
+        # An expired result for the same query beats no search context at all
+        last = _search_cache.peek(key)
+        logger.error("Web search failed%s: %s", ", serving last good result" if last else "", e)
+        return last or ""
+
+
+async def _search(client, query: str, max_results: int) -> str:
+    global _upstream_seconds
+    logger.info("Web search: '%s'", query[:100])
+    start = time.monotonic()
+    try:
+        response = await client.search(
             query=f"sports {query}",
             search_depth="basic",
             max_results=max_results,
             include_answer=True,
         )
+    except Exception:
+        # Once per upstream call, however many requests were waiting on it
+        UPSTREAM_ERRORS.inc(upstream="tavily")
+        raise
+    elapsed = time.monotonic() - start
+    _upstream_seconds += elapsed
+    WEB_SEARCH_SECONDS.observe(elapsed)
 
-        parts = []
-
-        # Include the AI-generated answer summary if available
-        if response.get("answer"):
-            parts.append(f"Summary: {response['answer']}")
+    parts = []
 
-        # Include individual search results
-        for result in response.get("results", []):
-            title = result.get("title", "")
-            content = result.get("content", "")
-            url = result.get("url", "")
-            if content:
-                parts.append(f"- {title}: {content[:300]}")
+    # Include the AI-generated answer summary if available
+    if response.get("answer"):
+        parts.append(f"Summary: {response['answer']}")
 
-        context = "\n".join(parts)
-        logger.info("Web search returned %d results, %d chars", len(response.get("results", [])), len(context))
-        return context
+    # Include individual search results
+    for result in response.get("results", []):
+        title = result.get("title", "")
+        content = result.get("content", "")
+        if content:
+            parts.append(f"- {title}: {content[:300]}")
 
-    except Exception as e:
-        logger.error("Web search failed: %s", e)
-        return ""
+    context = "\n".join(parts)
+    logger.info("Web search returned %d results, %d chars", len(response.get("results", [])), len(context))
+    return context
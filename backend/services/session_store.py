@@ -0,0 +1,71 @@
+import logging
+from typing import Any, Optional
+
+from config import settings
+from services import db_service
+from services.cache_service import LRUCache, invalidation_bus_running
+
+
+logger = logging.getLogger("sportsgpt.sessions")
+
+# Hot conversation histories for chats that send only the new message:
+# conversation_id -> (user_id, [{"role", "content"}, ...]). A worker that
+# appends a turn invalidates the other workers' copies over the cache bus;
+# they reload from the database plus the write-behind queue. Without the bus
+# a worker would never hear of turns taken elsewhere, so histories are then
+# only kept hot when there is a single worker.
+_sessions = LRUCache("sessions", settings.session_store_size, shared=True)
+_stats = {"loads": 0}
+
+
+def _enabled() -> bool:
+    return settings.single_worker or invalidation_bus_running()
+
+
+def _message_key(message: dict[str, Any]) -> tuple:
+    return message["role"], message["content"], message.get("created_at")
+
+
+async def get_history(user_id: str, conversation_id: str) -> Optional[list[dict[str, str]]]:
+    """The conversation's messages, or None if it does not exist or belongs to someone else."""
+    enabled = _enabled()
+    session = _sessions.get(conversation_id) if enabled else None
+    if session is not None:
+        owner, messages = session
+        return list(messages) if owner == user_id else None
+
+    version = _sessions.version(conversation_id)
+    # Without the bus the database read cache can miss other workers' turns too
+    rows = await db_service.get_history(user_id, conversation_id, use_cache=enabled)
+    if rows is None:
+        return None
+    _stats["loads"] += 1
+    # Turns still in the write-behind queue are not in the database yet
+    stored = {_message_key(row) for row in rows}
+    rows = rows + [m for m in db_service.pending_messages(conversation_id) if _message_key(m) not in stored]
+    messages = [{"role": row["role"], "content": row["content"]} for row in rows]
+    if enabled:
+        _sessions.set(conversation_id, (user_id, messages), version)
+    return list(messages)
+
+
+def record_turn(conversation_id: str, user_id: Optional[str], user_message: str, reply: str) -> None:
+    """Append a finished turn to the conversation's hot session.
+
+    Without ``user_id`` (a client that sent its own history) the session is
+    dropped instead and reloaded on its next use.
+    """
+    session = _sessions.get(conversation_id)
+    _sessions.invalidate(conversation_id)
+    if session is None or user_id is None or session[0] != user_id:
+        return
+    messages = session[1] + [{"role": "user", "content": user_message}, {"role": "assistant", "content": reply}]
+    _sessions.set(conversation_id, (user_id, messages))
+
+
+def drop(conversation_id: str) -> None:
+    _sessions.invalidate(conversation_id)
+
+
+def get_session_stats() -> dict[str, Any]:
+    return {**_sessions.stats(), **_stats}
@@ -1,6 +1,27 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from datetime import date, datetime, timezone, timedelta
+from typing import Any, Optional
+
 import httpx
-from datetime import datetime, timezone, timedelta
-from typing import Any
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from config import settings
+from services import resources, score_archive
+from services.cache_service import TTLCache
+from services.http_cache import EncodedBody
+from services.metrics import SCOREBOARD_FETCH_SECONDS, UPSTREAM_ERRORS
+from services.upstream import Upstream
+
+
+logger = logging.getLogger("sportsgpt.sports")
 
 
 SPORT_ENDPOINTS = {
@@ -29,86 +50,317 @@ BASE_URL = "https://site.api.espn.com/apis/site/v2/sports"
 # Don't show results older than this
 MAX_STALENESS = timedelta(days=7)
 
+# Statuses that mean a game is currently being played
+LIVE_STATUSES = {"In Progress", "Halftime"}
+
+# Sort order: live games first, then scheduled, then completed
+STATUS_ORDER = {"In Progress": 0, "Halftime": 0, "Scheduled": 1, "Final": 2, "Result": 2}
+
+# Scoreboards keyed by sport; shared by /api/scores and /api/chat
+_scoreboard_cache = TTLCache("scoreboard", stale_ttl=settings.scores_stale_ttl,
+                             max_entries=settings.scoreboard_cache_size)
+
+_espn = Upstream("espn")
+
+# Serialized scoreboards keyed by (sport, dates), kept with the result they were
+# made from so a cache hit returning the same result is not serialized again
+_serialized: OrderedDict[tuple, tuple[dict[str, Any], bytes]] = OrderedDict()
+# Latest /api/scores body per (sports, dates), reused while its bytes are unchanged
+_bodies: OrderedDict[tuple, EncodedBody] = OrderedDict()
+
+
+class Game:
+    """One scoreboard game, holding only the fields we serve.
+
+    Supports ``game["field"]`` and ``game.get()`` like the dicts it replaces;
+    the response dict is built lazily by ``to_dict`` and memoized.
+    """
+
+    FIELDS = (
+        "id", "name", "status",
+        "home_team", "home_abbreviation", "home_score", "home_logo", "home_color",
+        "away_team", "away_abbreviation", "away_score", "away_logo", "away_color",
+        "start_time", "is_cricket",
+    )
+    CRICKET_FIELDS = ("home_innings", "away_innings")
+
+    __slots__ = FIELDS + CRICKET_FIELDS + ("completed", "_dict")
+
+    def __init__(self, completed: bool = False, **fields: Any):
+        for name in self.FIELDS + self.CRICKET_FIELDS:
+            setattr(self, name, fields.get(name))
+        self.completed = completed
+        self._dict = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS and not (self.is_cricket and key in self.CRICKET_FIELDS):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict[str, Any]:
+        if self._dict is None:
+            names = self.FIELDS + self.CRICKET_FIELDS if self.is_cricket else self.FIELDS
+            self._dict = {name: getattr(self, name) for name in names}
+        return self._dict
 
-def _is_recent(date_str: str) -> bool:
+
+def _sort_key(game: Game) -> tuple[int, str]:
+    return STATUS_ORDER.get(game.status, 1), game.start_time
+
+
+def _is_recent(date_str: str, cutoff: datetime) -> bool:
     """Check if a game date is within the staleness window."""
     if not date_str:
         return False
     try:
-        game_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-        now = datetime.now(timezone.utc)
-        return (now - game_date) < MAX_STALENESS
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00")) > cutoff
     except (ValueError, TypeError):
         return False
 
 
-async def get_live_scores(sport: str) -> dict[str, Any]:
-    """Fetch live scores from ESPN's public API."""
-    endpoint = SPORT_ENDPOINTS.get(sport.lower())
-    if not endpoint:
+def serialize_scores(result: dict[str, Any]) -> dict[str, Any]:
+    """The /api/scores response shape for a get_live_scores result."""
+    if "games" not in result:
+        return result
+    return {**result, "games": [game.to_dict() for game in result["games"]]}
+
+
+def _scores_json(key: tuple, result: dict[str, Any]) -> bytes:
+    cached = _serialized.get(key)
+    if cached is not None and cached[0] is result:
+        _serialized.move_to_end(key)
+        return cached[1]
+    data = json.dumps(serialize_scores(result), ensure_ascii=False, separators=(",", ":")).encode()
+    _serialized[key] = (result, data)
+    while len(_serialized) > settings.scores_body_cache_size:
+        _serialized.popitem(last=False)
+    return data
+
+
+async def get_scores_body(sports: list[str], dates: Optional[tuple[date, date]] = None) -> EncodedBody:
+    """The /api/scores body: one sport's scores, or ``{"scores": [...]}`` for several.
+
+    Each sport is serialized once per scoreboard snapshot and the batch is
+    assembled from those bytes. While the bytes are unchanged the same
+    ``EncodedBody`` (and its ETag and compressed forms) is returned.
+    """
+    results = await asyncio.gather(*(get_live_scores(sport, dates=dates) for sport in sports))
+    parts = [_scores_json((sport, dates), result) for sport, result in zip(sports, results)]
+    body = parts[0] if len(parts) == 1 else b'{"scores":[' + b",".join(parts) + b"]}"
+
+    key = (tuple(sports), dates)
+    previous = _bodies.get(key)
+    if previous is not None and previous.body == body:
+        _bodies.move_to_end(key)
+        return previous
+    encoded = _bodies[key] = EncodedBody(body)
+    _bodies.move_to_end(key)
+    while len(_bodies) > settings.scores_body_cache_size:
+        _bodies.popitem(last=False)
+    return encoded
+
+
+def has_live_games(result: dict[str, Any]) -> bool:
+    return any(game.status in LIVE_STATUSES for game in result.get("games", ()))
+
+
+def _scoreboard_ttl(result: dict[str, Any]) -> float:
+    """Refresh quickly while a game is in progress, slowly otherwise."""
+    if has_live_games(result):
+        return settings.scores_live_ttl
+    return settings.scores_idle_ttl
+
+
+def get_cache_stats() -> dict[str, Any]:
+    return _scoreboard_cache.stats()
+
+
+async def get_live_scores(
+    sport: str,
+    allow_stale: bool = True,
+    dates: Optional[tuple[date, date]] = None,
+) -> dict[str, Any]:
+    """Fetch live scores, served from the shared scoreboard cache when fresh.
+
+    With ``allow_stale`` an expired scoreboard is returned immediately while
+    it is refreshed in the background. ``dates`` is an inclusive
+    ``(start, end)`` range; each day's scoreboard is fetched concurrently and
+    days on which every game is final are served from the on-disk archive.
+    """
+    sport = sport.lower()
+    if sport not in SPORT_ENDPOINTS:
         return {
             "error": f"Unsupported sport: {sport}",
             "supported": list(SPORT_ENDPOINTS.keys()),
         }
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(f"{BASE_URL}/{endpoint}/scoreboard")
+    if dates is not None:
+        return await _get_scores_for_dates(sport, *dates)
+
+    try:
+        return await _scoreboard_cache.get_or_fetch(
+            sport,
+            lambda: _fetch_scores(sport),
+            ttl=_scoreboard_ttl,
+            allow_stale=allow_stale,
+        )
+    except Exception as e:
+        return _last_good(sport, e)
+
+
+def _last_good(key: Any, error: Exception) -> dict[str, Any]:
+    """The last scoreboard fetched for ``key``, however old, or re-raise ``error``."""
+    last = _scoreboard_cache.peek(key)
+    if last is None:
+        raise error
+    logger.warning("Serving last good %s scoreboard: %s", key, error)
+    return last
+
+
+async def _get_scores_for_dates(sport: str, start: date, end: date) -> dict[str, Any]:
+    # The assembled range is cached too, so repeat requests get the same result
+    # object and reuse its serialized bytes (see _scores_json)
+    return await _scoreboard_cache.get_or_fetch(
+        (sport, start, end),
+        lambda: _assemble_dates(sport, start, end),
+        ttl=_scoreboard_ttl,
+        allow_stale=False,
+    )
+
+
+async def _assemble_dates(sport: str, start: date, end: date) -> dict[str, Any]:
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    results = await asyncio.gather(*(_get_day(sport, day) for day in days))
+    games = [game for result in results for game in result["games"]]
+    games.sort(key=_sort_key)
+    return {"sport": sport, "games": games, "dates": f"{start:%Y%m%d}-{end:%Y%m%d}"}
+
+
+async def _get_day(sport: str, day: date) -> dict[str, Any]:
+    archived = await score_archive.get_archived(sport, day)
+    if archived is not None:
+        return {"sport": sport, "games": [Game(completed=True, **game) for game in archived]}
+    try:
+        return await _scoreboard_cache.get_or_fetch(
+            (sport, day),
+            lambda: _fetch_day(sport, day),
+            ttl=_scoreboard_ttl,
+        )
+    except Exception as e:
+        return _last_good((sport, day), e)
+
+
+async def _get_scoreboard(endpoint: str, params: Optional[dict[str, str]] = None) -> httpx.Response:
+    """GET a scoreboard through the ESPN breaker, hedged past the recent p95 latency."""
+    async def get() -> httpx.Response:
+        response = await resources.get_http().get(f"{BASE_URL}/{endpoint}/scoreboard", params=params)
         response.raise_for_status()
-        data = response.json()
+        return response
+
+    try:
+        return await _espn.call(get, hedge=True)
+    except httpx.HTTPError:
+        UPSTREAM_ERRORS.inc(upstream="espn")
+        raise
+
 
-    is_cricket = sport.lower() in CRICKET_SPORTS
+async def _fetch_day(sport: str, day: date) -> dict[str, Any]:
+    """Fetch one day's scoreboard and archive it if the day is over and all its games are final."""
+    endpoint = SPORT_ENDPOINTS[sport]
+    logger.info("Fetching %s scoreboard for %s from ESPN", sport, day)
+
+    with SCOREBOARD_FETCH_SECONDS.time(sport=sport):
+        response = await _get_scoreboard(endpoint, {"dates": f"{day:%Y%m%d}"})
+        games = parse_scoreboard(response.content, sport, recent_only=False)
+    # An empty day is never archived: it may be a truncated or transient response
+    if day < date.today() and games and all(game.completed for game in games):
+        await score_archive.archive(sport, day, [game.to_dict() for game in games])
+    return {"sport": sport, "games": games}
+
+
+async def refresh_scores(sport: str) -> dict[str, Any]:
+    """Force a fresh scoreboard fetch for a supported sport and update the cache."""
+    sport = sport.lower()
+    return await _scoreboard_cache.refresh(sport, lambda: _fetch_scores(sport), ttl=_scoreboard_ttl)
+
+
+async def _fetch_scores(sport: str) -> dict[str, Any]:
+    """Fetch live scores from ESPN's public API."""
+    endpoint = SPORT_ENDPOINTS[sport]
+    logger.info("Fetching %s scoreboard from ESPN", sport)
+
+    with SCOREBOARD_FETCH_SECONDS.time(sport=sport):
+        response = await _get_scoreboard(endpoint)
+        return {"sport": sport, "games": parse_scoreboard(response.content, sport)}
+
+
+def _innings(competitor: dict[str, Any]) -> list[str]:
+    """Cricket innings as "runs/wickets" (or just runs when all out)."""
+    innings_list = []
+    for inn in competitor.get("linescores", ()):
+        runs = inn.get("runs", 0)
+        wickets = inn.get("wickets", 0)
+        overs = inn.get("overs", 0)
+        if runs or wickets or overs:
+            if wickets == 10 or inn.get("description", "") == "all out":
+                innings_list.append(f"{runs}")
+            else:
+                innings_list.append(f"{runs}/{wickets}")
+    return innings_list
+
+
+def parse_scoreboard(content: bytes, sport: str, recent_only: bool = True) -> list[Game]:
+    """Parse an ESPN scoreboard payload into games, live games first.
+
+    With ``recent_only`` games older than MAX_STALENESS are skipped.
+    """
+    data = _json_loads(content)
+    is_cricket = sport in CRICKET_SPORTS
+    cutoff = datetime.now(timezone.utc) - MAX_STALENESS
 
     games = []
-    for event in data.get("events", []):
+    for event in data.get("events", ()):
         event_date = event.get("date", "")
 
         # Skip stale results
-        if not _is_recent(event_date):
+        if recent_only and not _is_recent(event_date, cutoff):
             continue
 
-        competition = event["competitions"][0]
-        competitors = competition["competitors"]
+        competitors = event["competitions"][0]["competitors"]
         home = competitors[0]
         away = competitors[1]
+        home_team = home["team"]
+        away_team = away["team"]
 
-        game_data: dict[str, Any] = {
-            "name": event.get("name", ""),
-            "status": event.get("status", {}).get("type", {}).get("description", ""),
-            "home_team": home["team"]["displayName"],
-            "home_abbreviation": home["team"].get("abbreviation", ""),
-            "home_score": home.get("score", "0"),
-            "home_logo": home["team"].get("logo", ""),
-            "home_color": home["team"].get("color", ""),
-            "away_team": away["team"]["displayName"],
-            "away_abbreviation": away["team"].get("abbreviation", ""),
-            "away_score": away.get("score", "0"),
-            "away_logo": away["team"].get("logo", ""),
-            "away_color": away["team"].get("color", ""),
-            "start_time": event_date,
-            "is_cricket": is_cricket,
-        }
-
-        # For cricket, extract detailed scoring info from linescores
-        if is_cricket:
-            for prefix, competitor in [("home", home), ("away", away)]:
-                linescores = competitor.get("linescores", [])
-                innings_list = []
-                for inn in linescores:
-                    runs = inn.get("runs", 0)
-                    wickets = inn.get("wickets", 0)
-                    overs = inn.get("overs", 0)
-                    desc = inn.get("description", "")
-                    if runs or wickets or overs:
-                        if wickets == 10 or desc == "all out":
-                            innings_list.append(f"{runs}")
-                        else:
-                            innings_list.append(f"{runs}/{wickets}")
-                game_data[f"{prefix}_innings"] = innings_list
-
-        games.append(game_data)
+        status_type = event.get("status", {}).get("type", {})
+        games.append(Game(
+            id=event.get("id", ""),
+            name=event.get("name", ""),
+            status=status_type.get("description", ""),
+            completed=status_type.get("completed", False),
+            home_team=home_team["displayName"],
+            home_abbreviation=home_team.get("abbreviation", ""),
+            home_score=home.get("score", "0"),
+            home_logo=home_team.get("logo", ""),
+            home_color=home_team.get("color", ""),
+            away_team=away_team["displayName"],
+            away_abbreviation=away_team.get("abbreviation", ""),
+            away_score=away.get("score", "0"),
+            away_logo=away_team.get("logo", ""),
+            away_color=away_team.get("color", ""),
+            start_time=event_date,
+            is_cricket=is_cricket,
+            # For cricket, extract detailed scoring info from linescores
+            home_innings=_innings(home) if is_cricket else None,
+            away_innings=_innings(away) if is_cricket else None,
+        ))
 
     # Sort: live games first, then scheduled, then completed
-    STATUS_ORDER = {"In Progress": 0, "Halftime": 0, "Scheduled": 1, "Final": 2, "Result": 2}
-    games.sort(key=lambda g: (STATUS_ORDER.get(g["status"], 1), g.get("start_time", "")))
-
-    return {"sport": sport, "games": games}
+    games.sort(key=_sort_key)
+    return games
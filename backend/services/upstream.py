@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from config import settings
+from services.metrics import UPSTREAM_BREAKER_STATE, UPSTREAM_HEDGE_WINS, UPSTREAM_HEDGES, UPSTREAM_SHORT_CIRCUITS
+
+
+logger = logging.getLogger("sportsgpt.upstream")
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Latencies kept per upstream for the hedge delay; p95 needs a few before it means anything
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+
+_upstreams: dict[str, "Upstream"] = {}
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """Whether an error says the upstream is unhealthy.
+
+    A 4xx response is the request's fault (a bad ``dates`` parameter, say),
+    except for timeouts and rate limiting; everything else counts.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status in (408, 429)
+    return True
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} circuit open, retry in {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class Upstream:
+    """Circuit breaker and hedging policy for one upstream service.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls fail fast with ``CircuitOpen`` for ``open_seconds``; then a single
+    probe call is let through and its outcome closes or re-opens the breaker.
+
+    Hedged calls start a second attempt once the first has taken longer than
+    the upstream's recent p95 latency and return whichever succeeds first.
+    Only use them for idempotent requests.
+
+    ``call`` only counts errors for which ``is_failure`` is true.
+    """
+
+    def __init__(self, name: str, is_failure: Callable[[Exception], bool] = is_upstream_failure):
+        self.name = name
+        self.is_failure = is_failure
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._p95: Optional[float] = None
+        self._since_p95 = 0
+        self.calls = 0
+        self.failures = 0
+        self.short_circuits = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        UPSTREAM_BREAKER_STATE.set(0, upstream=name)
+        _upstreams[name] = self
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning("%s circuit %s -> %s", self.name, self.state, state)
+            self.state = state
+            UPSTREAM_BREAKER_STATE.set(_STATE_VALUES[state], upstream=self.name)
+
+    def open_for(self) -> float:
+        """Seconds until an open breaker lets a probe through; 0 if calls are allowed."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + settings.upstream_open_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpen`` if the breaker is not letting calls through."""
+        if self.state == OPEN:
+            remaining = self._opened_at + settings.upstream_open_seconds - time.monotonic()
+            if remaining <= 0 and not self._probing:
+                self._set_state(HALF_OPEN)
+            else:
+                self.short_circuits += 1
+                UPSTREAM_SHORT_CIRCUITS.inc(upstream=self.name)
+                raise CircuitOpen(self.name, max(remaining, 1.0))
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.short_circuits += 1
+                UPSTREAM_SHORT_CIRCUITS.inc(upstream=self.name)
+                raise CircuitOpen(self.name, 1.0)
+            self._probing = True
+        self.calls += 1
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        self._failures = 0
+        self._probing = False
+        self._set_state(CLOSED)
+        if latency is not None:
+            self._latencies.append(latency)
+            # Recompute the p95 every MIN_SAMPLES new samples, not on every call
+            self._since_p95 += 1
+            if self._since_p95 >= MIN_SAMPLES:
+                self._p95 = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self._failures >= settings.upstream_failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe that ended without a verdict (e.g. cancelled)."""
+        self._probing = False
+
+    def hedge_delay(self) -> float:
+        """How long the first attempt may run before a hedge is sent: the recent p95, clamped."""
+        if len(self._latencies) < MIN_SAMPLES:
+            return settings.hedge_max_delay
+        if self._p95 is None:
+            ordered = sorted(self._latencies)
+            self._p95 = ordered[math.ceil(len(ordered) * 0.95) - 1]
+            self._since_p95 = 0
+        return min(max(self._p95, settings.hedge_min_delay), settings.hedge_max_delay)
+
+    async def call(self, fn: Callable[[], Awaitable[T]], hedge: bool = False) -> T:
+        """Run ``fn()`` through the breaker, hedged if asked."""
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = await (self._hedged(fn) if hedge else fn())
+        except asyncio.CancelledError:
+            self.release_probe()
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure()
+            else:
+                self.release_probe()
+            raise
+        self.record_success(time.monotonic() - start)
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if not done:
+                self.hedges += 1
+                UPSTREAM_HEDGES.inc(upstream=self.name)
+                tasks.add(asyncio.ensure_future(fn()))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                            UPSTREAM_HEDGE_WINS.inc(upstream=self.name)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "calls": self.calls,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedges / self.calls, 4) if self.calls else 0.0,
+            "hedge_delay_seconds": round(self.hedge_delay(), 3),
+        }
+
+
+def get_upstream_stats() -> dict[str, dict[str, Any]]:
+    return {name: upstream.stats() for name, upstream in _upstreams.items()}
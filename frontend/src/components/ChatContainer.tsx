@@ -4,7 +4,7 @@ import { useState, useRef, useCallback, useEffect } from "react";
 import { Message, ScoresResponse } from "@/types";
 import {
   streamChat,
-  fetchScores,
+  fetchScoresBatch,
   fetchConversations,
   createConversation,
   deleteConversation,
@@ -179,19 +179,13 @@ export function ChatContainer() {
       // Fetch live scores if the user is asking about scores
       const sports = detectSports(content);
       if (sports.length > 0) {
-        const scoresResults: ScoresResponse[] = [];
-        await Promise.all(
-          sports.map(async (sport) => {
-            try {
-              const data = await fetchScores(sport);
-              if (data && data.games) {
-                scoresResults.push(data);
-              }
-            } catch {
-              // silently skip
-            }
-          })
-        );
+        let scoresResults: ScoresResponse[] = [];
+        try {
+          const results: ScoresResponse[] = await fetchScoresBatch(sports);
+          scoresResults = results.filter((data) => data && data.games);
+        } catch {
+          // silently skip
+        }
 
         if (scoresResults.length > 0) {
           setMessages((prev) => {
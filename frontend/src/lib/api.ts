@@ -15,6 +15,49 @@ async function getAuthHeaders(): Promise<Record<string, string>> {
   return { "Content-Type": "application/json" };
 }
 
+const MAX_RESUME_ATTEMPTS = 5;
+
+interface SSEEvent {
+  event: string;
+  id?: string;
+  data: string;
+}
+
+// Parses a text/event-stream body into events, yielding each as it completes
+async function* readEvents(body: ReadableStream<Uint8Array>): AsyncGenerator<SSEEvent> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let event: SSEEvent = { event: "message", data: "" };
+  let dataLines: string[] = [];
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split(/\r\n|\r|\n/);
+    buffer = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line === "") {
+        if (dataLines.length > 0) {
+          yield { ...event, data: dataLines.join("\n") };
+        }
+        event = { event: "message", data: "" };
+        dataLines = [];
+      } else if (line.startsWith(":")) {
+        // Heartbeat comment
+      } else {
+        const colon = line.indexOf(":");
+        const field = colon === -1 ? line : line.slice(0, colon);
+        const value = colon === -1 ? "" : line.slice(colon + 1).replace(/^ /, "");
+        if (field === "event") event.event = value;
+        else if (field === "id") event.id = value;
+        else if (field === "data") dataLines.push(value);
+      }
+    }
+  }
+}
+
 export function streamChat(
   messages: { role: string; content: string }[],
   onChunk: (chunk: string) => void,
@@ -23,46 +66,79 @@ export function streamChat(
   conversationId?: string
 ): AbortController {
   const controller = new AbortController();
+  let streamId: string | null = null;
 
   (async () => {
-    try {
-      const headers = await getAuthHeaders();
-      const body: Record<string, unknown> = { messages };
-      if (conversationId) {
-        body.conversation_id = conversationId;
-      }
-
-      const response = await fetch(`${API_URL}/api/chat`, {
-        method: "POST",
-        headers,
-        body: JSON.stringify(body),
-        signal: controller.signal,
-      });
-
-      if (!response.ok) {
-        throw new Error(`Server error: ${response.status}`);
-      }
-
-      if (!response.body) {
-        throw new Error("No response body");
-      }
-
-      const reader = response.body.getReader();
-      const decoder = new TextDecoder();
-
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-        const text = decoder.decode(value, { stream: true });
-        onChunk(text);
-      }
-      onDone();
-    } catch (error) {
-      if ((error as Error).name === "AbortError") {
-        onDone();
+    let lastEventId: string | null = null;
+    let attempts = 0;
+
+    while (true) {
+      try {
+        let response: Response;
+        if (streamId && lastEventId) {
+          // Reconnect to the generation already running on the server
+          response = await fetch(`${API_URL}/api/chat/streams/${streamId}`, {
+            headers: { "Last-Event-ID": lastEventId },
+            signal: controller.signal,
+          });
+        } else {
+          const headers = await getAuthHeaders();
+          let body: Record<string, unknown> = { messages };
+          if (conversationId && headers.Authorization) {
+            // The server keeps the history of saved conversations: send only the new message
+            body = { conversation_id: conversationId, message: messages[messages.length - 1].content };
+          } else if (conversationId) {
+            body.conversation_id = conversationId;
+          }
+          response = await fetch(`${API_URL}/api/chat`, {
+            method: "POST",
+            headers,
+            body: JSON.stringify(body),
+            signal: controller.signal,
+          });
+        }
+
+        if (!response.ok) {
+          throw new Error(`Server error: ${response.status}`);
+        }
+
+        if (!response.body) {
+          throw new Error("No response body");
+        }
+
+        for await (const event of readEvents(response.body)) {
+          if (event.id) lastEventId = event.id;
+          if (event.event === "stream") {
+            streamId = JSON.parse(event.data).stream_id;
+          } else if (event.event === "message") {
+            onChunk(JSON.parse(event.data).text);
+            attempts = 0;
+          } else if (event.event === "done") {
+            onDone();
+            return;
+          } else if (event.event === "error") {
+            throw new Error(JSON.parse(event.data).message);
+          }
+        }
+        throw new TypeError("Stream ended before the response was complete");
+      } catch (error) {
+        if ((error as Error).name === "AbortError") {
+          if (streamId) {
+            // Stop the server-side generation too
+            fetch(`${API_URL}/api/chat/streams/${streamId}`, { method: "DELETE" }).catch(() => {});
+          }
+          onDone();
+          return;
+        }
+        // Network drops are retried against the same stream; server errors are not
+        if (error instanceof TypeError && streamId && lastEventId && attempts < MAX_RESUME_ATTEMPTS) {
+          attempts += 1;
+          await new Promise((resolve) => setTimeout(resolve, 500 * attempts));
+          continue;
+        }
+        onError(error as Error);
         return;
       }
-      onError(error as Error);
     }
   })();
 
@@ -77,6 +153,19 @@ export async function fetchScores(sport: string) {
   return response.json();
 }
 
+// One request for several sports; the browser revalidates it with the ETag
+export async function fetchScoresBatch(sports: string[]) {
+  const response = await fetch(`${API_URL}/api/scores?sport=${sports.join(",")}`);
+  if (!response.ok) {
+    throw new Error(`Server error: ${response.status}`);
+  }
+  if (sports.length === 1) {
+    return [await response.json()];
+  }
+  const data = await response.json();
+  return data.scores;
+}
+
 export async function fetchConversations() {
   const headers = await getAuthHeaders();
   const response = await fetch(`${API_URL}/api/conversations`, { headers });
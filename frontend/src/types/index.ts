@@ -7,6 +7,7 @@ export interface Message {
 }
 
 export interface Game {
+  id?: string;
   name: string;
   status: string;
   home_team: string;